@@ -6,9 +6,58 @@ retrieve market data, and handle account information.
 
 Modules:
     _types: Defines data types and enums used across the API.
+    accounts: Many account sessions in one event loop with shared caches.
     api: Main API connector class for interacting with XTB services.
+    bars: Live aggregation of streamed prices into bars of every period.
+    benchmark: Load benchmarks of Api against a local emulator.
+    catalog: Cached symbol metadata catalog.
+    chart: Columnar chart data backed by NumPy arrays.
+    emulator: Local stand-in for the xAPI servers.
     errors: Handles API error management.
+    executors: Off-loop execution of subscription listeners.
+    gateway: Local Unix-socket gateway sharing sessions between programs.
+    history: Concurrent, resumable chart history downloader.
+    hooks: Profiling hooks of the request and streaming paths.
+    metrics: Latency and throughput metrics with a Prometheus exporter.
+    pool: Pool of command sessions sharing one account.
+    quotes: Shared live quote book with depth ladders.
+    ratelimit: Request rate limiting honouring xAPI connection rules.
+    reconnect: Backoff policy of automatic reconnects.
+    recorder: Compressed columnar recorder of streamed ticks and candles.
+    shm: Shared-memory tick ring buffer for local worker processes.
+    store: Memory-mapped on-disk store of chart bars.
+    streams: Bounded asynchronous iterators over streaming subscriptions.
 """
 
 from ._types import *  # noqa: F403
+from .accounts import Account, AccountManager  # noqa: F401
 from .api import Api  # noqa: F401
+from .bars import Bar, BarBuilder  # noqa: F401
+from .catalog import SymbolCatalog  # noqa: F401
+from .chart import ChartFrame  # noqa: F401
+from .emulator import XapiEmulator  # noqa: F401
+from .executors import (  # noqa: F401
+    InlineExecutor,
+    ListenerExecutor,
+    ProcessPoolListenerExecutor,
+    ThreadPoolListenerExecutor,
+    WorkerExecutor,
+)
+from .gateway import Gateway  # noqa: F401
+from .history import HistoryDownloader, HistoryWindow  # noqa: F401
+from .hooks import HookPoint, Hooks  # noqa: F401
+from .metrics import Histogram, Metrics  # noqa: F401
+from .pool import ApiPool  # noqa: F401
+from .quotes import Quote, QuoteBook, QuoteSnapshot  # noqa: F401
+from .ratelimit import Priority, RateLimiter, RateLimiterStats  # noqa: F401
+from .reconnect import ReconnectPolicy  # noqa: F401
+from .recorder import TickReader, TickRecorder  # noqa: F401
+from .shm import ShmCandle, ShmTick, ShmTickPublisher, ShmTickReader  # noqa: F401
+from .store import BarStore  # noqa: F401
+from .streams import (  # noqa: F401
+    ConflatedStream,
+    OverflowPolicy,
+    Stream,
+    StreamOverflowError,
+    StreamStats,
+)
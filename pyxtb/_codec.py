@@ -0,0 +1,118 @@
+import enum
+import functools
+import types
+import typing
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+from dataclasses_json import CatchAll, DataClassJsonMixin
+
+T = TypeVar("T")
+
+_PRIMITIVES = (int, float, str, bool)
+
+
+def _unwrap_optional_(hint):
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return hint
+
+
+@functools.cache
+def decoder(Type: type[T]) -> Callable[[dict], T]:
+    """
+    Returns a decoder of raw API dictionaries specialised for a record type.
+
+    The decoder is generated once per type and produces the same objects as
+    `Type.from_dict` for records in `_types`: numbers, strings and booleans are coerced
+    to the annotated type, enums are converted by value, nested records and lists of
+    records are decoded recursively and unknown fields are collected in the catch-all
+    field. Input already containing the catch-all field is passed to `Type.from_dict`.
+
+    Args:
+        Type (type[T]): Record class decorated with `dataclass_json`.
+
+    Returns:
+        Callable[[dict], T]: Decoder function.
+    """
+    hints = typing.get_type_hints(Type)
+    namespace: dict[str, Any] = {
+        "_cls": Type,
+        "_new": object.__new__,
+        "_from_dict": Type.from_dict,
+        "_isinstance": isinstance,
+        "_list": list,
+        "_map": map,
+    }
+    names = [field.name for field in fields(Type) if field.init]
+    catch_all = next((name for name in names if hints[name] == CatchAll), None)
+    known = frozenset(name for name in names if name != catch_all)
+    namespace["_known"] = known
+
+    lines = ["def decode(data):"]
+    if catch_all:
+        lines += [
+            f"    if {catch_all!r} in data:",
+            "        return _from_dict(data)",
+            "    if data.keys() <= _known:",
+            "        other = {}",
+            "    else:",
+            "        other = {k: v for k, v in data.items() if k not in _known}",
+        ]
+    values = []
+    for index, name in enumerate(names):
+        if name == catch_all:
+            values.append(f"{name!r}: other")
+            continue
+        var = f"_{index}"
+        values.append(f"{name!r}: {var}")
+        lines.append(f"    {var} = data[{name!r}]")
+        hint = _unwrap_optional_(hints[name])
+        origin = typing.get_origin(hint)
+        if origin is Literal or origin in (typing.Union, types.UnionType):
+            continue
+        if origin is list:
+            (item,) = typing.get_args(hint) or (Any,)
+            if is_dataclass(item):
+                namespace[f"_T{index}"] = decoder(item)
+                lines.append(f"    if {var} is not None:")
+                lines.append(f"        {var} = _list(_map(_T{index}, {var}))")
+            continue
+        if isinstance(hint, type) and issubclass(hint, enum.Enum):
+            namespace[f"_T{index}"] = hint
+            lines.append(f"    if {var} is not None:")
+            lines.append(f"        {var} = _T{index}({var})")
+        elif is_dataclass(hint):
+            namespace[f"_T{index}"] = decoder(hint)
+            lines.append(f"    if {var} is not None:")
+            lines.append(f"        {var} = _T{index}({var})")
+        elif hint in _PRIMITIVES:
+            namespace[f"_T{index}"] = hint
+            lines.append(
+                f"    if {var} is not None and not _isinstance({var}, _T{index}):"
+            )
+            lines.append(f"        {var} = _T{index}({var})")
+    lines += [
+        "    obj = _new(_cls)",
+        f"    obj.__dict__ = {{{', '.join(values)}}}",
+        "    return obj",
+    ]
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
+
+
+def decode(Type: DataClassJsonMixin, data: dict | list[dict]):
+    """
+    Decodes a raw API record or a list of records.
+
+    Args:
+        Type (DataClassJsonMixin): Record class.
+        data (dict | list[dict]): Raw record or list of records.
+
+    Returns:
+        Decoded record or list of records.
+    """
+    decode_fn = decoder(Type)
+    return decode_fn(data) if isinstance(data, dict) else list(map(decode_fn, data))
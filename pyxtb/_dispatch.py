@@ -0,0 +1,150 @@
+from typing import Callable
+
+MESSAGE_COMMANDS = {
+    "candles": "candle",
+    "profits": "profit",
+    "trades": "trade",
+}
+"Streaming subscriptions whose messages arrive under a different command name."
+
+KEY_FIELDS = {
+    "candle": "symbol",
+    "tickPrices": "symbol",
+}
+"Fields of streaming messages the server keeps a separate subscription for."
+
+Listener = Callable[[dict], None]
+
+
+class StreamDispatcher:
+    """
+    Routes streaming messages to listeners indexed by (command, key).
+
+    For per-symbol streams the key is the symbol, otherwise it is None, so each message
+    reaches only its own listeners. Listeners are reference counted per key, which tells
+    the caller when the server subscription has to be started or stopped.
+    """
+
+    def __init__(self):
+        self._listeners: dict[tuple[str, str | None], tuple[Listener, ...]] = {}
+        self._subscriptions: dict[tuple[str, str | None], tuple[str, dict]] = {}
+        self._taps: dict[str, tuple[Listener, ...]] = {}
+
+    @staticmethod
+    def _key_(command: str, kwargs: dict) -> tuple[str, str | None]:
+        message_command = MESSAGE_COMMANDS.get(command, command)
+        field = KEY_FIELDS.get(message_command)
+        return message_command, kwargs.get(field) if field else None
+
+    def add(self, command: str, listener: Listener, kwargs: dict) -> bool:
+        """
+        Register a listener of a subscription.
+
+        Args:
+            command (str): Subscription command, e.g. "tickPrices".
+            listener (Listener): Callback receiving raw message data.
+            kwargs (dict): Subscription arguments.
+
+        Returns:
+            bool: True if this is the first listener and the server subscription has to be started.
+        """
+        key = self._key_(command, kwargs)
+        listeners = self._listeners.get(key, ())
+        self._listeners[key] = (*listeners, listener)
+        if not listeners:
+            self._subscriptions[key] = (command, kwargs)
+        return not listeners
+
+    def remove(self, command: str, listener: Listener, kwargs: dict) -> bool:
+        """
+        Unregister a listener of a subscription.
+
+        Args:
+            command (str): Subscription command, e.g. "tickPrices".
+            listener (Listener): Previously registered callback.
+            kwargs (dict): Subscription arguments.
+
+        Returns:
+            bool: True if this was the last listener and the server subscription has to be stopped.
+        """
+        key = self._key_(command, kwargs)
+        listeners = self._listeners.get(key, ())
+        if listener not in listeners:
+            return False
+        remaining = tuple(el for el in listeners if el is not listener)
+        if remaining:
+            self._listeners[key] = remaining
+            return False
+        del self._listeners[key]
+        del self._subscriptions[key]
+        return True
+
+    def add_tap(self, command: str, listener: Listener):
+        """
+        Register a listener of all messages of a command regardless of their key.
+
+        Taps do not start or stop server subscriptions.
+
+        Args:
+            command (str): Command name of streaming messages, e.g. "candle".
+            listener (Listener): Callback receiving raw message data.
+        """
+        self._taps[command] = (*self._taps.get(command, ()), listener)
+
+    def remove_tap(self, command: str, listener: Listener):
+        """
+        Unregister a tap listener.
+
+        Args:
+            command (str): Command name of streaming messages.
+            listener (Listener): Previously registered callback.
+        """
+        taps = tuple(el for el in self._taps.get(command, ()) if el is not listener)
+        if taps:
+            self._taps[command] = taps
+        else:
+            self._taps.pop(command, None)
+
+    def has_listeners(self, command: str, data: dict) -> bool:
+        """
+        Whether a streaming message belongs to a subscription with listeners.
+
+        Args:
+            command (str): Command name of the streaming message.
+            data (dict): Message data.
+
+        Returns:
+            bool: True if the subscription of the message has listeners, taps not included.
+        """
+        field = KEY_FIELDS.get(command)
+        return (command, data.get(field) if field else None) in self._listeners
+
+    def dispatch(self, command: str, data: dict) -> bool:
+        """
+        Deliver a streaming message to its listeners.
+
+        Args:
+            command (str): Command name of the streaming message.
+            data (dict): Message data.
+
+        Returns:
+            bool: True if any listener received the message.
+        """
+        taps = self._taps.get(command)
+        if taps:
+            for tap in taps:
+                tap(data)
+        field = KEY_FIELDS.get(command)
+        listeners = self._listeners.get((command, data.get(field) if field else None))
+        if not listeners:
+            return bool(taps)
+        for listener in listeners:
+            listener(data)
+        return True
+
+    @property
+    def subscriptions(self) -> list[tuple[str, dict]]:
+        """
+        Active server subscriptions as (command, kwargs) of their first listener.
+        """
+        return list(self._subscriptions.values())
@@ -0,0 +1,101 @@
+import asyncio
+import codecs
+import json
+from asyncio import StreamReader, StreamWriter
+from typing import AsyncIterator, Awaitable, Callable
+
+from .api import FRAME_DELIMITER
+
+_JSON = json.JSONDecoder()
+
+
+async def read_requests(reader: StreamReader) -> AsyncIterator[dict]:
+    """
+    Yield JSON requests sent by xAPI clients.
+
+    Clients write requests back to back without a delimiter, so a read may hold a part
+    of a request or several of them. Requests are decoded from a buffer as soon as they
+    are complete.
+
+    Args:
+        reader (StreamReader): Reader of a client connection.
+
+    Yields:
+        dict: Decoded request.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    while chunk := await reader.read(65536):
+        buffer += text.decode(chunk)
+        while buffer := buffer.lstrip():
+            try:
+                request, end = _JSON.raw_decode(buffer)
+            except json.JSONDecodeError:
+                break
+            buffer = buffer[end:]
+            yield request
+
+
+def encode_frame(message: dict) -> bytes:
+    """
+    Encode a reply or streaming message ending with the xAPI frame delimiter.
+    """
+    return json.dumps(message).encode() + FRAME_DELIMITER
+
+
+def track_connection(
+    handler: Callable[[StreamReader, StreamWriter], Awaitable[None]],
+    connections: set[asyncio.Task],
+) -> Callable[[StreamReader, StreamWriter], Awaitable[None]]:
+    """
+    Wrap a connection handler so its task is kept in `connections` while it runs.
+
+    Disconnects and cancellation end the handler quietly, the writer is closed when
+    the handler returns.
+
+    Args:
+        handler (Callable): Connection handler of `asyncio.start_server`.
+        connections (set[asyncio.Task]): Tasks of the open connections, cancelled on close.
+
+    Returns:
+        Callable: Wrapped connection handler.
+    """
+
+    async def connection(reader: StreamReader, writer: StreamWriter):
+        task = asyncio.current_task()
+        connections.add(task)
+        try:
+            await handler(reader, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            connections.discard(task)
+            writer.close()
+
+    return connection
+
+
+def parse_stream_request(request: dict) -> tuple[bool, str, dict] | None:
+    """
+    Split a streaming subscribe or unsubscribe request.
+
+    Args:
+        request (dict): Request sent on the streaming connection, e.g.
+            `{"command": "getTickPrices", "streamSessionId": "...", "symbol": "EURUSD"}`.
+
+    Returns:
+        tuple[bool, str, dict] | None: True for a subscribe request and False for an
+            unsubscribe request, the stream name, e.g. `tickPrices`, and the request
+            arguments without `command` and `streamSessionId`. None for other requests.
+    """
+    command = request.get("command", "")
+    if not command.startswith(("get", "stop")):
+        return None
+    prefix = "get" if command.startswith("get") else "stop"
+    name = command[len(prefix)].lower() + command[len(prefix) + 1 :]
+    arguments = {
+        key: value
+        for key, value in request.items()
+        if key not in ("command", "streamSessionId")
+    }
+    return prefix == "get", name, arguments
@@ -0,0 +1,443 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from dataclasses_json import DataClassJsonMixin
+
+from ._codec import decode
+from ._types import SymbolRecord
+from .api import Api
+from .catalog import DEFAULT_TTL, SymbolCatalog
+
+T = TypeVar("T")
+
+SHARED_COMMANDS = {
+    "getTradingHours": 6 * 60 * 60,
+    "getStepRules": 6 * 60 * 60,
+    "getCalendar": 60 * 60,
+}
+"Account-independent commands answered from the shared cache, with their TTL in seconds."
+
+SYMBOL_COMMANDS = ("getAllSymbols", "getSymbol")
+"Commands answered from the shared `SymbolCatalog` of the server."
+
+DEFAULT_MAX_CONCURRENCY = 16
+"Default number of commands of all accounts in flight at once."
+
+
+@dataclass
+class Account:
+    """
+    Credentials and settings of one account of an `AccountManager`
+    """
+
+    login: int
+    password: str
+    demo: bool = True
+    name: str | None = None
+    "Key of the account in the manager, defaults to the login"
+    options: dict[str, Any] = field(default_factory=dict)
+    "Additional keyword arguments of the account's `Api`"
+
+    @property
+    def key(self) -> str:
+        """
+        Name of the account, or its login if it has no name.
+        """
+        return self.name or str(self.login)
+
+
+class _FairScheduler:
+    """
+    Limits commands in flight and hands free slots to waiting accounts in turn.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._active = 0
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self._turns: deque[str] = deque()
+
+    async def acquire(self, key: str):
+        if self._active < self._limit and not self._turns:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            waiters = self._waiters[key] = deque()
+            self._turns.append(key)
+        waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._turns:
+            key = self._turns.popleft()
+            waiters = self._waiters[key]
+            future = waiters.popleft()
+            if waiters:
+                self._turns.append(key)
+            else:
+                del self._waiters[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+
+class _ManagedApi(Api):
+    """
+    Account session sending its commands through the manager.
+    """
+
+    def __init__(self, manager: "AccountManager", key: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._manager = manager
+        self._account_key = key
+
+    async def _send_and_read_command_(
+        self, cmd: str, Type: DataClassJsonMixin | None, as_json: bool = False, **kwargs
+    ):
+        if cmd in SYMBOL_COMMANDS:
+            return await self._manager._symbols_(self, cmd, as_json or not Type, kwargs)
+        if cmd in self._manager._shared_commands:
+            return await self._manager._shared_(self, cmd, Type, as_json, kwargs)
+        return await self._manager._scheduled_(self, cmd, Type, as_json, kwargs)
+
+
+class _CatalogApi:
+    """
+    Downloads symbols of a shared catalog through a logged in account of its server.
+    """
+
+    def __init__(self, manager: "AccountManager", server: tuple[str, int]):
+        self._manager = manager
+        self._server = server
+
+    def _session_(self) -> "_ManagedApi":
+        for session in self._manager.sessions.values():
+            if session._logged_in and _server_(session) == self._server:
+                return session
+        raise ConnectionError("No account of the server is logged in")
+
+    async def get_all_symbols(self, as_json: bool = False):
+        return await self._manager._scheduled_(
+            self._session_(), "getAllSymbols", SymbolRecord, as_json, {}
+        )
+
+    async def get_symbol(self, symbol: str, as_json: bool = False):
+        return await self._manager._scheduled_(
+            self._session_(),
+            "getSymbol",
+            SymbolRecord,
+            as_json,
+            {"arguments": {"symbol": symbol}},
+        )
+
+
+def _server_(session: Api) -> tuple[str, int]:
+    return session._address, session._connection_info.port
+
+
+class AccountManager:
+    """
+    Many account sessions in one event loop with shared account-independent data.
+
+    Every account gets its own `Api` with its own connections, subscriptions and
+    pending requests. Symbols (`SYMBOL_COMMANDS`) are answered from one `SymbolCatalog`
+    per server shared by all accounts. Replies of other account-independent commands
+    (`SHARED_COMMANDS`, e.g. `getTradingHours`) are fetched once per server by whichever
+    account asks first and cached for all accounts, concurrent requests wait for the
+    same download. Cached records are shared between accounts, treat them as read-only.
+    Other commands of all accounts share `max_concurrency` slots, which are handed to
+    waiting accounts in turn, so a busy account does not starve the others.
+
+    Examples:
+        >>> accounts = [Account(1000000, "password"), Account(1000001, "password")]
+        >>> async with AccountManager(accounts) as manager:
+        >>>     margins = await manager.call("get_margin_level")
+        >>>     symbols = await manager.get_all_symbols()
+        >>>     trades = await manager["1000000"].get_trades(openedOnly=True)
+    """
+
+    def __init__(
+        self,
+        accounts: list[Account],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        shared_commands: dict[str, float] = SHARED_COMMANDS,
+        catalog_ttl: float = DEFAULT_TTL,
+        **kwargs,
+    ):
+        """
+        Initialize AccountManager object
+
+        Args:
+            accounts (list[Account]): Accounts to log in.
+            max_concurrency (int, optional): Commands of all accounts in flight at once. Defaults to 16.
+            shared_commands (dict[str, float], optional): Cached commands with their TTL in seconds. Defaults to `SHARED_COMMANDS`.
+            catalog_ttl (float, optional): Seconds after which the symbol catalogs are downloaded again. Defaults to 6 hours.
+            **kwargs: Additional keyword arguments passed to every `Api`, overridden by `Account.options`.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.accounts = {account.key: account for account in accounts}
+        if len(self.accounts) != len(accounts):
+            raise ValueError("Account names must be unique")
+        self._shared_commands = dict(shared_commands)
+        self._scheduler = _FairScheduler(max_concurrency)
+        self._sessions: dict[str, _ManagedApi] = {
+            key: _ManagedApi(
+                self,
+                key,
+                account.login,
+                account.password,
+                demo=account.demo,
+                **{**kwargs, **account.options},
+            )
+            for key, account in self.accounts.items()
+        }
+        self._cache: dict[tuple, tuple[float, Any, dict]] = {}
+        self._fetching: dict[tuple, asyncio.Task] = {}
+        self._catalog_ttl = catalog_ttl
+        self._catalogs: dict[tuple[str, int], SymbolCatalog] = {}
+        self.failed: dict[str, Exception] = {}
+        "Accounts which failed to log in with their errors."
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.gather(
+            *(
+                session.__aexit__(exc_type, exc, tb)
+                for key, session in self._sessions.items()
+                if key not in self.failed
+            ),
+            return_exceptions=True,
+        )
+        return False
+
+    async def login(self):
+        """
+        Log in all accounts concurrently.
+
+        Accounts which fail to log in are left out and listed in `failed`.
+
+        Raises:
+            Exception: If no account logged in.
+        """
+        keys = list(self._sessions)
+        results = await asyncio.gather(
+            *(self._sessions[key].login() for key in keys), return_exceptions=True
+        )
+        self.failed = {
+            key: result
+            for key, result in zip(keys, results)
+            if isinstance(result, Exception)
+        }
+        for key, error in self.failed.items():
+            logging.error(f"Login of account {key} failed: {error}")
+        if keys and len(self.failed) == len(keys):
+            raise Exception("Login of all accounts failed") from results[0]
+
+    def __getitem__(self, key: str) -> Api:
+        return self._sessions[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sessions)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def sessions(self) -> dict[str, Api]:
+        """
+        Logged in sessions keyed by account name.
+        """
+        return {
+            key: session
+            for key, session in self._sessions.items()
+            if key not in self.failed
+        }
+
+    async def _scheduled_(
+        self,
+        session: _ManagedApi,
+        cmd: str,
+        Type: DataClassJsonMixin | None,
+        as_json: bool,
+        kwargs: dict,
+    ):
+        """
+        Sends a command of an account once the fair scheduler grants it a slot.
+        """
+        await self._scheduler.acquire(session._account_key)
+        try:
+            return await Api._send_and_read_command_(
+                session, cmd, Type, as_json=as_json, **kwargs
+            )
+        finally:
+            self._scheduler.release()
+
+    async def _shared_(
+        self,
+        session: _ManagedApi,
+        cmd: str,
+        Type: DataClassJsonMixin | None,
+        as_json: bool,
+        kwargs: dict,
+    ):
+        """
+        Answers an account-independent command from the cache, fetching it once if needed.
+        """
+        key = (
+            *_server_(session),
+            cmd,
+            json.dumps(kwargs, sort_keys=True, default=str),
+        )
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > self._shared_commands[cmd]:
+            task = self._fetching.get(key)
+            if task is None:
+                task = self._fetching[key] = asyncio.ensure_future(
+                    self._fetch_(session, key, cmd, kwargs)
+                )
+                task.add_done_callback(lambda _: self._fetching.pop(key, None))
+            entry = await asyncio.shield(task)
+        _, data, decoded = entry
+        if as_json or not Type:
+            return data
+        if Type not in decoded:
+            decoded[Type] = decode(Type, data)
+        return decoded[Type]
+
+    async def _fetch_(
+        self, session: _ManagedApi, key: tuple, cmd: str, kwargs: dict
+    ) -> tuple[float, Any, dict]:
+        data = await self._scheduled_(session, cmd, None, True, kwargs)
+        entry = self._cache[key] = (time.monotonic(), data, {})
+        return entry
+
+    def catalog(self, key: str | None = None) -> SymbolCatalog:
+        """
+        Shared symbol catalog of the server of an account.
+
+        Args:
+            key (str | None, optional): Account name. Defaults to any logged in account.
+
+        Returns:
+            SymbolCatalog: Catalog used by all accounts of the server.
+        """
+        session = self._sessions[key] if key else self._any_session_()
+        server = _server_(session)
+        catalog = self._catalogs.get(server)
+        if catalog is None:
+            catalog = self._catalogs[server] = SymbolCatalog(
+                _CatalogApi(self, server), ttl=self._catalog_ttl
+            )
+        return catalog
+
+    async def _symbols_(
+        self, session: _ManagedApi, cmd: str, as_json: bool, kwargs: dict
+    ):
+        """
+        Answers a symbol command from the shared catalog of the server of an account.
+        """
+        catalog = self.catalog(session._account_key)
+        if cmd == "getSymbol":
+            symbol = await catalog.get_symbol(kwargs["arguments"]["symbol"])
+            return symbol.to_dict(encode_json=True) if as_json else symbol
+        symbols = await catalog.get_all_symbols()
+        return (
+            [symbol.to_dict(encode_json=True) for symbol in symbols]
+            if as_json
+            else symbols
+        )
+
+    def invalidate(self, command: str | None = None):
+        """
+        Drop cached replies so they are fetched again.
+
+        Args:
+            command (str | None, optional): Command to drop. Defaults to all commands.
+        """
+        if command is None or command in SYMBOL_COMMANDS:
+            self._catalogs.clear()
+        for key in list(self._cache):
+            if command is None or key[2] == command:
+                del self._cache[key]
+
+    def _any_session_(self) -> Api:
+        for session in self.sessions.values():
+            if session._logged_in:
+                return session
+        raise ConnectionError("No account is logged in")
+
+    async def gather(
+        self, function: Callable[[Api], Awaitable[T]]
+    ) -> dict[str, T | Exception]:
+        """
+        Run a coroutine function for every logged in account concurrently.
+
+        Args:
+            function (Callable[[Api], Awaitable[T]]): Function called with the session of each account.
+
+        Returns:
+            dict[str, T | Exception]: Results keyed by account name, failed calls hold their exception.
+        """
+        sessions = self.sessions
+        results = await asyncio.gather(
+            *(function(session) for session in sessions.values()),
+            return_exceptions=True,
+        )
+        return dict(zip(sessions, results))
+
+    async def call(self, method: str, *args, **kwargs) -> dict[str, Any]:
+        """
+        Call an `Api` method on every logged in account concurrently.
+
+        Args:
+            method (str): Name of the method, e.g. "get_margin_level".
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            dict[str, Any]: Results keyed by account name, failed calls hold their exception.
+        """
+        return await self.gather(
+            lambda session: getattr(session, method)(*args, **kwargs)
+        )
+
+    async def get_all_symbols(self, **kwargs):
+        """
+        Shared symbol catalog, see `Api.get_all_symbols`.
+        """
+        return await self._any_session_().get_all_symbols(**kwargs)
+
+    async def get_trading_hours(self, symbols: list[str], **kwargs):
+        """
+        Shared trading hours, see `Api.get_trading_hours`.
+        """
+        return await self._any_session_().get_trading_hours(symbols, **kwargs)
+
+    async def get_step_rules(self, **kwargs):
+        """
+        Shared step rules, see `Api.get_step_rules`.
+        """
+        return await self._any_session_().get_step_rules(**kwargs)
+
+    async def get_calendar(self, **kwargs):
+        """
+        Shared economic calendar, see `Api.get_calendar`.
+        """
+        return await self._any_session_().get_calendar(**kwargs)
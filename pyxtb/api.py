@@ -1,13 +1,18 @@
 import asyncio
+import itertools
 import json
 import logging
+import ssl as _ssl
+import time
 from asyncio import StreamReader, StreamWriter, Task
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, TypeVar
+from typing import TYPE_CHECKING, Callable, TypeVar
 
 from dataclasses_json import DataClassJsonMixin
 
+from ._codec import decode, decoder
+from ._dispatch import StreamDispatcher
 from ._types import (
     LOGIN_RESPONSE,
     RESPONSE,
@@ -43,7 +48,25 @@ from ._types import (
     TradingHoursRecord,
     VersionRecord,
 )
+from .chart import ChartFrame
 from .errors import handle_error
+from .hooks import Hooks
+from .metrics import Metrics
+from .quotes import QuoteBook
+from .ratelimit import (
+    COMMAND_PRIORITIES,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_INTERVAL,
+    Priority,
+    RateLimiter,
+    RateLimiterStats,
+)
+from .reconnect import ReconnectPolicy, is_replayable
+from .streams import DEFAULT_STREAM_SIZE, ConflatedStream, OverflowPolicy, Stream
+
+if TYPE_CHECKING:
+    from .executors import ListenerExecutor
+    from .store import BarStore
 
 T = TypeVar("T")
 
@@ -52,6 +75,14 @@ logging.basicConfig(level=logging.INFO)
 
 DEFAULT_XAPI_ADDRESS = "xapi.xtb.com"
 
+UNIX_PREFIX = "unix:"
+"Address prefix of a local `Gateway` socket, the streaming socket has the `.stream` suffix."
+
+FRAME_DELIMITER = b"\n\n"
+"Every reply and streaming message sent by xAPI ends with two new line characters."
+
+_STREAM_LIMIT = 64 * 1024 * 1024
+
 
 class Api:
     """
@@ -88,8 +119,8 @@ class Api:
     _stream_session_id: str | None = None
     _streaming_reader: StreamReader | None = None
     _streaming_writer: StreamWriter | None = None
-    _callbacks = defaultdict(list)
     _reading_task: Task | None = None
+    _command_reading_task: Task | None = None
     _connection_info: _ConnectionInfo
 
     def __init__(
@@ -99,17 +130,73 @@ class Api:
         app_name="pyxtb",
         address=DEFAULT_XAPI_ADDRESS,
         demo: bool = True,
+        request_interval: float = DEFAULT_REQUEST_INTERVAL,
+        request_burst: int = DEFAULT_REQUEST_BURST,
+        bar_store: "BarStore | None" = None,
+        ssl: bool | _ssl.SSLContext = True,
+        port: int | None = None,
+        streaming_port: int | None = None,
+        reconnect: ReconnectPolicy | None = None,
+        heartbeat_interval: float | None = None,
+        heartbeat_timeout: float = 5.0,
+        metrics: Metrics | None = None,
+        hooks: Hooks | None = None,
     ):
         """
         Initialize Api object
+
+        Args:
+            request_interval (float, optional): Minimal spacing between requests on one connection in seconds. 0 disables rate limiting. Defaults to 0.2.
+            request_burst (int, optional): Number of requests which may be sent without spacing. Defaults to 5.
+            bar_store (BarStore | None, optional): Local store answering chart range requests, only missing ranges are fetched. Defaults to None.
+            ssl (bool | SSLContext, optional): TLS setting of both connections, False for plain TCP e.g. to a local `XapiEmulator`. Defaults to True.
+            port (int | None, optional): Command port overriding the demo/real port. Defaults to None.
+            streaming_port (int | None, optional): Streaming port overriding the demo/real port. Defaults to None.
+            reconnect (ReconnectPolicy | None, optional): Log in again when the command connection drops, restoring subscriptions and replaying read-only commands, a dropped streaming connection alone is reopened without disturbing commands. Defaults to None.
+            heartbeat_interval (float | None, optional): Seconds without outgoing traffic after which a connection is pinged, None disables the heartbeat. Defaults to None.
+            heartbeat_timeout (float, optional): Seconds to wait for the reply to a heartbeat ping before the command connection is considered dead. Defaults to 5.0.
+            metrics (Metrics | None, optional): Registry recording round trips, traffic, errors and stream lag, may be shared by several instances. Defaults to None.
+            hooks (Hooks | None, optional): Profiling hooks of the request and streaming paths, may be shared by several instances. Defaults to an empty registry.
         """
 
         self._login = login
         self._password = password
         self._app_name = app_name
         self._address = address
-        self._connection_info = Api._DEMO if demo else Api._REAL
-        
+        connection_info = Api._DEMO if demo else Api._REAL
+        self._connection_info = Api._ConnectionInfo(
+            port=port or connection_info.port,
+            streaming=streaming_port or connection_info.streaming,
+        )
+        self._ssl = ssl
+        self._tags = itertools.count()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._dispatcher = StreamDispatcher()
+        self._blocked_streams: set[Stream] = set()
+        self._bar_store = bar_store
+        self.quote_book = QuoteBook()
+        "Latest quotes of all symbols subscribed with `subscribe_tick_prices`."
+        self._command_limiter = RateLimiter(request_interval, request_burst)
+        self._streaming_limiter = RateLimiter(request_interval, request_burst)
+        self._reconnect_policy = reconnect
+        self._reconnect_task: Task | None = None
+        self._reconnecting_streaming = False
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._requests: dict[str, tuple[str, dict]] = {}
+        self.reconnects = 0
+        "Number of successful automatic reconnects."
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._heartbeat_task: Task | None = None
+        self._command_sent_at = 0.0
+        self._streaming_sent_at = 0.0
+        self.heartbeat_rtts: deque[float] = deque(maxlen=1000)
+        "Round trip times of the latest heartbeat pings of the command connection in seconds."
+        self.metrics = metrics
+        "Metrics registry, None if metrics are not recorded."
+        self.hooks = hooks if hooks is not None else Hooks()
+        "Profiling hooks, see `Hooks`."
 
     async def __aenter__(self):
         """
@@ -129,8 +216,20 @@ class Api:
 
         Logs out of the API and closes connections when exiting the context.
         """
-        if self._logged_in:
+        self._closing = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+        if self._logged_in and self._connected.is_set():
             await self.logout()
+        exception = None
+        if self._reading_task:
+            if self._reading_task.done() and not self._reading_task.cancelled():
+                exception = self._reading_task.exception()
+            self._reading_task.cancel()
+        if self._command_reading_task:
+            self._command_reading_task.cancel()
         for stream in [
             self._writer,
             self._streaming_writer,
@@ -138,47 +237,65 @@ class Api:
             if stream and stream.can_write_eof():
                 stream.close()
                 await stream.wait_closed()
-        if self._reading_task:
-            if self._reading_task.done():
-                exception = self._reading_task.exception()
-                if exception:
-                    raise exception
-            self._reading_task.cancel()
+        if exception:
+            raise exception
         return False
 
-    async def _write_(self, writer: StreamWriter | None, data: str):
+    async def _write_(self, writer: StreamWriter | None, data: str) -> int:
         """
         Writes data to the specified stream writer.
 
         Args:
             writer (StreamWriter | None): The stream writer to write data to.
             data (str): The data to write.
+
+        Returns:
+            int: Number of bytes written.
         """
         if not self._writer:
             raise Exception("Writer not set up")
-        writer.write(data.encode())
+        payload = data.encode()
+        writer.write(payload)
+        if self.metrics:
+            self.metrics.add_bytes(
+                "streaming" if writer is self._streaming_writer else "command",
+                "out",
+                len(payload),
+            )
+        return len(payload)
 
-    async def _read_(self, reader: StreamReader | None, buffer_size=4096) -> str:
+    async def _read_(self, reader: StreamReader | None) -> str:
         """
-        Reads data from the specified stream reader.
+        Reads a single frame from the specified stream reader.
+
+        Frames are split on the xAPI `FRAME_DELIMITER`. Bytes received after the
+        delimiter stay buffered in the reader and are returned by the next call,
+        so coalesced or fragmented messages are always decoded one by one.
 
         Args:
             reader (StreamReader | None): The stream reader to read data from.
-            buffer_size (int, optional): The buffer size for reading data. Defaults to 4096.
 
         Returns:
-            str: The read data as a string.
+            str: The frame contents without the delimiter.
+
+        Raises:
+            ConnectionError: If the connection was closed by the server.
         """
         if not reader:
             raise Exception("Reader not set up")
-        data = bytearray()
-        while True:
-            await asyncio.sleep(0.01)
-            chunk = await reader.read(buffer_size)
-            data += chunk
-            if len(chunk) != buffer_size:
-                break
-        return data.decode().strip()
+        try:
+            frame = await reader.readuntil(FRAME_DELIMITER)
+        except asyncio.IncompleteReadError as e:
+            raise ConnectionError("Connection closed by server") from e
+        if self.metrics:
+            self.metrics.add_bytes(
+                "streaming" if reader is self._streaming_reader else "command",
+                "in",
+                len(frame),
+            )
+        if self.hooks.frame_received:
+            self.hooks._emit_(self.hooks.frame_received, None, len(frame))
+        return frame.decode().strip()
 
     async def _read_command_(self, reader: StreamReader | None, raw: bool = False):
         """
@@ -195,6 +312,12 @@ class Api:
         data = await self._read_(reader)
         if len(data) > 0:
             parsed_data: RESPONSE[T] = json.loads(data)
+            hooks = self.hooks
+            if hooks.after_parse:
+                command = parsed_data.get("command") or self._requests.get(
+                    parsed_data.get("customTag"), (None,)
+                )[0]
+                hooks._emit_(hooks.after_parse, command, len(data))
             if raw:
                 return parsed_data
 
@@ -223,7 +346,16 @@ class Api:
         if not unauthenticated and not self._logged_in:
             raise Exception("Not logged in")
 
-        await self._write_(
+        limiter = (
+            self._streaming_limiter
+            if writer is self._streaming_writer
+            else self._command_limiter
+        )
+        await limiter.acquire(COMMAND_PRIORITIES.get(command, Priority.NORMAL))
+        hooks = self.hooks
+        if hooks.before_serialize:
+            hooks._emit_(hooks.before_serialize, command)
+        size = await self._write_(
             writer,
             json.dumps(
                 {
@@ -232,15 +364,30 @@ class Api:
                 }
             ),
         )
+        if hooks.after_write:
+            hooks._emit_(hooks.after_write, command, size)
+        if writer is self._streaming_writer:
+            self._streaming_sent_at = time.monotonic()
+        else:
+            self._command_sent_at = time.monotonic()
 
     async def _stream_read_(self): 
         """
         Reads streaming data from the API and triggers callbacks.
 
         Continuously reads data from the streaming reader and triggers registered callbacks.
+        With a reconnect policy, a lost connection is reopened instead of failing.
         """
+        reader = self._streaming_reader
         while True:
-            parsed_data = await self._read_command_(self._streaming_reader, raw=True)
+            try:
+                parsed_data = await self._read_command_(reader, raw=True)
+            except OSError:
+                if reader is not self._streaming_reader or self._start_reconnect_(
+                    streaming_only=True
+                ):
+                    return
+                raise
 
             if not parsed_data:
                 continue
@@ -250,31 +397,92 @@ class Api:
                 logging.error(f"Received response: {parsed_data}")
                 continue
 
-            callbacks = self._callbacks.get(command)
+            if self.metrics:
+                self.metrics.observe_stream(command, parsed_data["data"])
+
+            if command == "tickPrices" and self._dispatcher.has_listeners(
+                command, parsed_data["data"]
+            ):
+                self.quote_book.update(parsed_data["data"])
 
-            if callbacks:
-                for callback in callbacks:
-                    callback(parsed_data["data"])
-            else:
-                logging.log(
-                    f"Received command: {command} with data: {parsed_data["data"]}"
+            if not self._dispatcher.dispatch(command, parsed_data["data"]):
+                logging.debug(
+                    f"Received command: {command} with data: {parsed_data['data']}"
                 )
 
-    async def login(self):
+            while self._blocked_streams:
+                await self._blocked_streams.pop().wait_writable()
+
+    async def _command_read_(self):
         """
-        Authenticate with the XTB API using provided credentials.
+        Reads command responses from the API and resolves pending requests.
 
-        Establishes a connection to the API server and initiates a streaming session.
+        Every command sent by `_send_and_read_command_` carries a unique `customTag`,
+        which the server echoes back in the response. Responses are matched to their
+        requests by that tag, so many commands can be in flight at once.
+        """
+        reader = self._reader
+        try:
+            while True:
+                response = await self._read_command_(reader, raw=True)
+                if not response:
+                    continue
+
+                future = self._pending.pop(response.get("customTag"), None)
+                if future and not future.done():
+                    future.set_result(response)
+                else:
+                    logging.debug(f"Received untagged response: {response}")
+        except BaseException as e:
+            if reader is not self._reader:
+                return
+            reconnecting = isinstance(e, OSError) and self._start_reconnect_()
+            for tag, future in list(self._pending.items()):
+                if reconnecting and is_replayable(self._requests[tag][0]):
+                    continue
+                del self._pending[tag]
+                if not future.done():
+                    future.set_exception(ConnectionError("Command connection lost"))
+            if not reconnecting:
+                raise e
+
+    async def _open_connection_(
+        self, streaming: bool
+    ) -> tuple[StreamReader, StreamWriter]:
+        """
+        Opens the command or streaming connection.
+
+        Addresses starting with `UNIX_PREFIX` connect to the Unix sockets of a local
+        `Gateway` without TLS, other addresses to the xAPI TCP ports.
+
+        Args:
+            streaming (bool): Whether to open the streaming connection.
+
+        Returns:
+            tuple[StreamReader, StreamWriter]: Reader and writer of the connection.
+        """
+        if self._address.startswith(UNIX_PREFIX):
+            path = self._address[len(UNIX_PREFIX) :]
+            return await asyncio.open_unix_connection(
+                path + ".stream" if streaming else path, limit=_STREAM_LIMIT
+            )
+        return await asyncio.open_connection(
+            self._address,
+            self._connection_info.streaming if streaming else self._connection_info.port,
+            ssl=self._ssl,
+            limit=_STREAM_LIMIT,
+        )
+
+    async def _login_command_(self):
+        """
+        Opens the command connection and authenticates on it.
+
+        Starts the command reading task and stores the `streamSessionId` returned by the server.
 
         Raises:
             Exception: If authentication fails or connection cannot be established.
-
-        Documentation:
-            [Login Endpoint](http://developers.xstore.pro/documentation/#login)
         """
-        self._reader, self._writer = await asyncio.open_connection(
-            self._address, self._connection_info.port, ssl=True
-        )
+        self._reader, self._writer = await self._open_connection_(streaming=False)
 
         await self._send_command_(
             self._writer,
@@ -290,15 +498,223 @@ class Api:
             raise Exception(response["errorDescr"])
 
         self._stream_session_id = response["streamSessionId"]
+        self._command_reading_task = asyncio.Task(self._command_read_())
+
+    async def _login_streaming_(self):
+        """
+        Opens the streaming connection and starts the streaming reading task.
+        """
         (
             self._streaming_reader,
             self._streaming_writer,
-        ) = await asyncio.open_connection(
-            self._address, self._connection_info.streaming, ssl=True
-        )
+        ) = await self._open_connection_(streaming=True)
         self._reading_task = asyncio.Task(self._stream_read_())
+
+    async def login(self):
+        """
+        Authenticate with the XTB API using provided credentials.
+
+        Establishes a connection to the API server and initiates a streaming session.
+
+        Raises:
+            Exception: If authentication fails or connection cannot be established.
+
+        Documentation:
+            [Login Endpoint](http://developers.xstore.pro/documentation/#login)
+        """
+        self._closing = False
+        await self._login_command_()
+        await self._login_streaming_()
         self._logged_in = True
-        self._callbacks = defaultdict(list)
+        self._connected.set()
+        await self.streaming_ping()
+        self._start_heartbeat_()
+
+    def _start_heartbeat_(self):
+        """
+        Starts the heartbeat task if a heartbeat interval is set and it is not running.
+        """
+        if not self._heartbeat_interval:
+            return
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.Task(self._heartbeat_())
+
+    async def _heartbeat_(self):
+        """
+        Pings connections which sent nothing for `heartbeat_interval` seconds.
+
+        Any outgoing command postpones the ping of its connection, so busy connections
+        are never pinged. The command connection is pinged with `ping` and its round trip
+        is appended to `heartbeat_rtts`. The streaming connection gets a streaming ping,
+        which the server does not answer. A command ping without a reply within
+        `heartbeat_timeout` closes the command connection, which starts a reconnect when
+        a reconnect policy is set. Without one the heartbeat stops.
+        """
+        interval = self._heartbeat_interval
+        while not self._closing:
+            if not self._connected.is_set():
+                await self._connected.wait()
+                continue
+            if not self._logged_in:
+                return
+            streaming = self._streaming_writer is not None
+            now = time.monotonic()
+            due = self._command_sent_at + interval
+            if streaming:
+                due = min(due, self._streaming_sent_at + interval)
+            if due > now:
+                await asyncio.sleep(due - now)
+                continue
+
+            if streaming and now - self._streaming_sent_at >= interval:
+                await self.streaming_ping()
+            if now - self._command_sent_at < interval:
+                continue
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    Api._request_(self, "ping"), self._heartbeat_timeout
+                )
+                if not response["status"]:
+                    handle_error(response)
+            except Exception as e:
+                if self._closing:
+                    return
+                logging.warning(f"Heartbeat ping failed: {e!r}")
+                if self._writer and not self._writer.is_closing():
+                    self._writer.close()
+                if not self._start_reconnect_():
+                    return
+                continue
+            self.heartbeat_rtts.append(time.perf_counter() - start)
+
+    def _start_reconnect_(self, streaming_only: bool = False) -> bool:
+        """
+        Starts the reconnect task unless it is running already.
+
+        A lost command connection restores both connections. A lost streaming connection
+        alone is reopened without touching the command connection, a command connection
+        lost meanwhile turns it into a full reconnect.
+
+        Args:
+            streaming_only (bool, optional): Whether only the streaming connection was lost. Defaults to False.
+
+        Returns:
+            bool: True if the connection is being restored, False without a reconnect policy or while closing.
+        """
+        if not self._reconnect_policy or self._closing or not self._logged_in:
+            return False
+        task = self._reconnect_task
+        if task is not None and not task.done():
+            if streaming_only or not self._reconnecting_streaming:
+                return True
+            task.cancel()
+        self._reconnecting_streaming = streaming_only
+        if streaming_only:
+            logging.warning("Streaming connection to xAPI lost, reconnecting")
+            self._reconnect_task = asyncio.Task(self._reconnect_streaming_())
+        else:
+            logging.warning("Connection to xAPI lost, reconnecting")
+            self._connected.clear()
+            self._reconnect_task = asyncio.Task(self._reconnect_())
+        return True
+
+    async def _close_connections_(self):
+        """
+        Closes both connections, their reading tasks end on their own.
+        """
+        for writer in [self._writer, self._streaming_writer]:
+            if writer and not writer.is_closing():
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+    async def _reconnect_(self):
+        """
+        Logs in again with backoff, then restores subscriptions and replays commands.
+
+        Every active subscription is started again with its original arguments under the
+        new `streamSessionId`. Read-only commands which were waiting for a reply are sent
+        again with their original `customTag`, other commands failed with `ConnectionError`
+        when the connection dropped.
+        """
+        policy = self._reconnect_policy
+        streaming = self._streaming_writer is not None
+        await self._close_connections_()
+        attempt = 0
+        while True:
+            attempt += 1
+            if policy.max_attempts and attempt > policy.max_attempts:
+                logging.error(f"Reconnect failed after {policy.max_attempts} attempts")
+                self._logged_in = False
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("Reconnect failed"))
+                self._pending.clear()
+                self._connected.set()
+                return
+            await asyncio.sleep(policy.delay(attempt))
+            try:
+                await self._login_command_()
+                if streaming:
+                    await self._login_streaming_()
+                break
+            except Exception as e:
+                logging.warning(f"Reconnect attempt {attempt} failed: {e}")
+                await self._close_connections_()
+
+        if streaming:
+            await self._restore_subscriptions_()
+        for tag in list(self._pending):
+            cmd, kwargs = self._requests[tag]
+            await self._send_command_(self._writer, cmd, customTag=tag, **kwargs)
+        self.reconnects += 1
+        self._connected.set()
+        logging.info(f"Reconnected to xAPI after {attempt} attempts")
+
+    async def _reconnect_streaming_(self):
+        """
+        Reopens the streaming connection with backoff, then restores subscriptions.
+
+        The command connection stays up and its `streamSessionId` stays valid, so
+        commands waiting for a reply are left alone.
+        """
+        policy = self._reconnect_policy
+        writer = self._streaming_writer
+        if writer and not writer.is_closing():
+            writer.close()
+        attempt = 0
+        while True:
+            attempt += 1
+            if policy.max_attempts and attempt > policy.max_attempts:
+                logging.error(
+                    f"Streaming reconnect failed after {policy.max_attempts} attempts"
+                )
+                return
+            await asyncio.sleep(policy.delay(attempt))
+            try:
+                await self._login_streaming_()
+                break
+            except Exception as e:
+                logging.warning(f"Streaming reconnect attempt {attempt} failed: {e}")
+
+        await self._restore_subscriptions_()
+        self.reconnects += 1
+        logging.info(f"Reconnected xAPI streaming after {attempt} attempts")
+
+    async def _restore_subscriptions_(self):
+        """
+        Starts every active subscription again on the streaming connection.
+        """
+        for command, kwargs in self._dispatcher.subscriptions:
+            await self._send_command_(
+                self._streaming_writer,
+                f"get{command[0].upper()}{command[1:]}",
+                streamSessionId=self._stream_session_id,
+                **kwargs,
+            )
         await self.streaming_ping()
 
     async def logout(self) -> RESPONSE[StreamingTradeStatusRecord]:
@@ -313,9 +729,42 @@ class Api:
         Documentation:
             [Logout Endpoint](http://developers.xstore.pro/documentation/#logout)
         """
+        self._closing = True
         await self._send_command_(self._writer, "logout")
         self._logged_in = False
 
+    async def _request_(self, cmd: str, **kwargs) -> RESPONSE:
+        """
+        Send a command to the API and wait for its raw response.
+
+        Args:
+            cmd (str): The command to send.
+            **kwargs: Additional keyword arguments for the command.
+
+        Returns:
+            RESPONSE: Response of the server, including error responses.
+        """
+        if self._reconnect_task and not self._connected.is_set():
+            await self._connected.wait()
+        tag = str(next(self._tags))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tag] = future
+        self._requests[tag] = (cmd, kwargs)
+        metrics = self.metrics
+        if metrics:
+            start = time.perf_counter()
+        try:
+            await self._send_command_(self._writer, cmd, customTag=tag, **kwargs)
+            response: RESPONSE[T] = await future
+        finally:
+            self._pending.pop(tag, None)
+            self._requests.pop(tag, None)
+        if metrics:
+            metrics.observe_command(cmd, time.perf_counter() - start)
+            if not response["status"]:
+                metrics.count_error(response.get("errorCode"))
+        return response
+
     async def _send_and_read_command_(
         self, cmd: str, Type: DataClassJsonMixin | None, as_json: bool = False, **kwargs
     ):
@@ -331,19 +780,30 @@ class Api:
         Returns:
             Parsed response data or raw JSON/dict based on as_json.
         """
-        await self._send_command_(self._writer, cmd, **kwargs)
-        data = await self._read_command_(self._reader)
+        response = await self._request_(cmd, **kwargs)
+        if not response["status"]:
+            handle_error(response)
+        metrics = self.metrics
+        data = response.get("returnData")
         if as_json:
             return data
 
         if not Type:
             return data
 
-        return (
-            Type.from_dict(data)
-            if isinstance(data, dict)
-            else [Type.from_dict(el) for el in data]
-        )
+        if not metrics and not self.hooks.after_decode:
+            return decode(Type, data)
+        start = time.perf_counter()
+        decoded = decode(Type, data)
+        if metrics:
+            metrics.observe_decode(cmd, time.perf_counter() - start)
+        if self.hooks.after_decode:
+            self.hooks._emit_(
+                self.hooks.after_decode,
+                cmd,
+                len(decoded) if isinstance(decoded, list) else 1,
+            )
+        return decoded
 
     async def get_all_symbols(self, as_json: bool = False, **kwargs) -> list[SymbolRecord] | dict:
         """
@@ -372,30 +832,40 @@ class Api:
         return await self._send_and_read_command_("getCalendar", CalendarRecord, as_json=as_json, **kwargs)
 
     async def get_chart_last_request(
-        self, info: ChartLastInfoRecord, as_json: bool = False, **kwargs
-    ) -> ChartResponseRecord | dict:
+        self,
+        info: ChartLastInfoRecord,
+        as_json: bool = False,
+        as_arrays: bool = False,
+        **kwargs,
+    ) -> ChartResponseRecord | ChartFrame | dict:
         """
         Retrieve the latest chart information based on the provided criteria.
 
         Args:
             info (ChartLastInfoRecord): Chart information.
             as_json (bool, optional): If True, returns raw JSON/dict. Defaults to False.
+            as_arrays (bool, optional): If True, returns columnar `ChartFrame` with decoded prices. Requires numpy. Defaults to False.
             **kwargs: Additional keyword arguments for the command.
 
         Returns:
-            ChartResponseRecord | dict: Chart response record or raw JSON/dict.
+            ChartResponseRecord | ChartFrame | dict: Chart response record, chart frame or raw JSON/dict.
         """
-        return await self._send_and_read_command_(
+        data = await self._send_and_read_command_(
             "getChartLastRequest",
             ChartResponseRecord,
-            as_json=as_json,
+            as_json=as_json or as_arrays,
             arguments=dict(info=info.to_dict()),
             **kwargs,
         )
+        return ChartFrame.from_json(data) if as_arrays and not as_json else data
 
     async def get_chart_range_request(
-        self, info: ChartRangeInfoRecord, as_json: bool = False, **kwargs
-    ) -> ChartResponseRecord | dict:
+        self,
+        info: ChartRangeInfoRecord,
+        as_json: bool = False,
+        as_arrays: bool = False,
+        **kwargs,
+    ) -> ChartResponseRecord | ChartFrame | dict:
         """
         Description: Please note that this function can be usually replaced by its streaming equivalent getCandles which is the preferred way of retrieving current candle data. Returns chart info with data between given start and end dates.
 
@@ -408,15 +878,21 @@ class Api:
 
         Note, that specific PERIOD_ is the lowest (i.e. the most detailed) period, accessible in listed range. For instance, in months range <1-7) you can access periods: PERIOD_M30, PERIOD_H1, PERIOD_H4, PERIOD_D1, PERIOD_W1, PERIOD_MN1. Specific data ranges availability is guaranteed, however those ranges may be wider, e.g.: PERIOD_M1 may be accessible for 1.5 months back from now, where 1.0 months is guaranteed.
 
+        Pass `as_arrays=True` to receive a columnar `ChartFrame` with decoded prices (requires numpy). With a `bar_store` configured, requests without `ticks` are answered from the store and only missing ranges are fetched from the server.
+
         [http://developers.xstore.pro/documentation/#getChartRangeRequest](http://developers.xstore.pro/documentation/#getChartRangeRequest)
         """
-        return await self._send_and_read_command_(
+        if self._bar_store and not as_json and not info.ticks:
+            return await self._bar_store.get_chart_range(self, info, as_arrays)
+
+        data = await self._send_and_read_command_(
             "getChartRangeRequest",
             ChartResponseRecord,
-            as_json=as_json,
+            as_json=as_json or as_arrays,
             arguments=dict(info=info.to_dict()),
             **kwargs,
         )
+        return ChartFrame.from_json(data) if as_arrays and not as_json else data
 
     async def get_commission_def(
         self, symbol: str, volume: float, as_json: bool = False, **kwargs
@@ -747,41 +1223,85 @@ class Api:
         command: str,
         Type: DataClassJsonMixin | None,
         eventListener: Callable[[T], None],
+        executor: "ListenerExecutor | None" = None,
         **kwargs,
     ):
         """
         Subscribe to a specific API command for real-time updates.
 
+        All `subscribe_*` methods pass the `executor` keyword argument through, e.g.
+        `api.subscribe_tick_prices(on_tick, "EURUSD", executor=pool)`.
+
         Args:
             command (str): The API command to subscribe to.
             Type (DataClassJsonMixin | None): The data class type for parsing the response.
             eventListener (Callable[[T], None]): The callback function to handle events.
+            executor (ListenerExecutor | None, optional): Executor running the callback and decoding, messages of one symbol keep their order. Defaults to calling it inline in the streaming reader.
             **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Unsubscribe function removing this listener. The server subscription is
+            started with the first listener of a command (and symbol) only.
         """
-        self._callbacks[command].append(
-            lambda data: eventListener(Type.from_dict(data)) if Type else eventListener
-        )
-        await self._send_command_(
-            self._streaming_writer,
-            f"get{command[0].upper()}{command[1:]}",
-            streamSessionId=self._stream_session_id,
-            **kwargs,
-        )
+
+        if executor is not None:
+
+            def listener(data: dict):
+                executor.submit(data.get("symbol"), eventListener, Type, data)
+
+        else:
+            decode_fn = decoder(Type) if Type else None
+            hooks = self.hooks
+
+            def listener(data: dict):
+                if not hooks.active:
+                    eventListener(decode_fn(data) if decode_fn else data)
+                    return
+                if decode_fn:
+                    data = decode_fn(data)
+                    if hooks.after_decode:
+                        hooks._emit_(hooks.after_decode, command, 1)
+                if hooks.before_callback:
+                    hooks._emit_(hooks.before_callback, command)
+                eventListener(data)
+                if hooks.after_callback:
+                    hooks._emit_(hooks.after_callback, command)
+
+        if self._dispatcher.add(command, listener, kwargs):
+            try:
+                await self._send_command_(
+                    self._streaming_writer,
+                    f"get{command[0].upper()}{command[1:]}",
+                    streamSessionId=self._stream_session_id,
+                    **kwargs,
+                )
+            except Exception:
+                self._dispatcher.remove(command, listener, kwargs)
+                raise
 
         async def unsubscribe_fn():
-            await self._unsubscribe_(command, **kwargs)
+            await self._unsubscribe_(command, listener, **kwargs)
 
         return unsubscribe_fn
 
-    async def _unsubscribe_(self, command: str, **kwargs):
+    async def _unsubscribe_(
+        self, command: str, listener: Callable[[dict], None], **kwargs
+    ):
         """
-        Unsubscribe from a specific API command.
+        Unsubscribe a listener from a specific API command.
+
+        The server subscription is stopped only when its last listener leaves, a
+        `tickPrices` symbol is then removed from `quote_book` as well.
 
         Args:
             command (str): The API command to unsubscribe from.
+            listener (Callable[[dict], None]): The listener registered by `_subscribe_`.
             **kwargs: Additional keyword arguments for the unsubscription.
         """
-        del self._callbacks[command]
+        if not self._dispatcher.remove(command, listener, kwargs):
+            return
+        if command == "tickPrices":
+            self.quote_book.remove(kwargs.get("symbol"))
         await self._send_command_(
             self._streaming_writer,
             f"stop{command[0].upper()}{command[1:]}",
@@ -905,6 +1425,260 @@ class Api:
             "tradeStatus", StreamingTradeStatusRecord, eventListener, **kwargs
         )
 
+    def _stream_(
+        self,
+        command: str,
+        Type: DataClassJsonMixin | None,
+        maxsize: int,
+        policy: OverflowPolicy,
+        **kwargs,
+    ) -> Stream:
+        """
+        Create a bounded stream of a subscription.
+
+        Args:
+            command (str): The API command to subscribe to.
+            Type (DataClassJsonMixin | None): The data class type messages are decoded to.
+            maxsize (int): Queue capacity.
+            policy (OverflowPolicy): Overflow policy of the queue.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream: Stream starting the subscription on its first pull.
+        """
+        return Stream(
+            lambda listener: self._subscribe_(command, None, listener, **kwargs),
+            Type,
+            maxsize,
+            policy,
+            self._blocked_streams,
+        )
+
+    def _conflated_stream_(
+        self,
+        command: str,
+        Type: DataClassJsonMixin | None,
+        key: tuple[str, ...],
+        **kwargs,
+    ) -> ConflatedStream:
+        """
+        Create a stream of a subscription keeping only the latest message of every key.
+
+        Args:
+            command (str): The API command to subscribe to.
+            Type (DataClassJsonMixin | None): The data class type messages are decoded to.
+            key (tuple[str, ...]): Message fields identifying the conflated value.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            ConflatedStream: Stream starting the subscription on its first pull.
+        """
+        return ConflatedStream(
+            lambda listener: self._subscribe_(command, None, listener, **kwargs),
+            Type,
+            key,
+        )
+
+    def stream_balance(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingBalanceRecord]:
+        """
+        Stream balance updates, see `subscribe_get_balance`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingBalanceRecord]: Asynchronous iterator of balance updates.
+        """
+        return self._stream_("balance", StreamingBalanceRecord, maxsize, policy, **kwargs)
+
+    def stream_candles(
+        self,
+        symbol: str,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingCandleRecord]:
+        """
+        Stream candles of a symbol, see `subscribe_get_candles`.
+
+        Args:
+            symbol (str): The trading symbol to subscribe to.
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingCandleRecord]: Asynchronous iterator of candles.
+        """
+        return self._stream_(
+            "candles", StreamingCandleRecord, maxsize, policy, symbol=symbol, **kwargs
+        )
+
+    def stream_keep_alive(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingKeepAliveRecord]:
+        """
+        Stream keep alive messages, see `subscribe_get_keep_alive`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingKeepAliveRecord]: Asynchronous iterator of keep alive messages.
+        """
+        return self._stream_(
+            "keepAlive", StreamingKeepAliveRecord, maxsize, policy, **kwargs
+        )
+
+    def stream_news(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingNewsRecord]:
+        """
+        Stream news, see `subscribe_get_news`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingNewsRecord]: Asynchronous iterator of news.
+        """
+        return self._stream_("news", StreamingNewsRecord, maxsize, policy, **kwargs)
+
+    def stream_profits(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        conflate: bool = False,
+        **kwargs,
+    ) -> Stream[StreamingProfitRecord]:
+        """
+        Stream profits of open trades, see `subscribe_get_profits`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            conflate (bool, optional): Keep only the latest undelivered profit of every order, `maxsize` and `policy` are ignored. Defaults to False.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingProfitRecord]: Asynchronous iterator of profits.
+        """
+        if conflate:
+            return self._conflated_stream_(
+                "profits", StreamingProfitRecord, ("order",), **kwargs
+            )
+        return self._stream_("profits", StreamingProfitRecord, maxsize, policy, **kwargs)
+
+    def stream_tick_prices(
+        self,
+        symbol: str,
+        minArrivalTime: int = 0,
+        maxLevel: int | None = None,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        conflate: bool = False,
+        **kwargs,
+    ) -> Stream[StreamingTickRecord]:
+        """
+        Stream quotations of a symbol, see `subscribe_tick_prices`.
+
+        Args:
+            symbol (str): The trading symbol to subscribe to.
+            minArrivalTime (int, optional): Minimal interval between ticks in milliseconds. Defaults to 0.
+            maxLevel (int | None, optional): Maximal price level. Defaults to None.
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            conflate (bool, optional): Keep only the latest undelivered tick of every price level, `maxsize` and `policy` are ignored. Defaults to False.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingTickRecord]: Asynchronous iterator of ticks.
+        """
+        kwargs.update(symbol=symbol, minArrivalTime=minArrivalTime, maxLevel=maxLevel)
+        if conflate:
+            return self._conflated_stream_(
+                "tickPrices", StreamingTickRecord, ("symbol", "level"), **kwargs
+            )
+        return self._stream_(
+            "tickPrices", StreamingTickRecord, maxsize, policy, **kwargs
+        )
+
+    def stream_trades(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingTradeRecord]:
+        """
+        Stream trade updates, see `subscribe_trades`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingTradeRecord]: Asynchronous iterator of trades.
+        """
+        return self._stream_("trades", StreamingTradeRecord, maxsize, policy, **kwargs)
+
+    def stream_trade_status(
+        self,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        **kwargs,
+    ) -> Stream[StreamingTradeStatusRecord]:
+        """
+        Stream statuses of sent trade requests, see `subscribe_trade_status`.
+
+        Args:
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            **kwargs: Additional keyword arguments for the subscription.
+
+        Returns:
+            Stream[StreamingTradeStatusRecord]: Asynchronous iterator of trade statuses.
+        """
+        return self._stream_(
+            "tradeStatus", StreamingTradeStatusRecord, maxsize, policy, **kwargs
+        )
+
+    def tap_stream(
+        self, command: str, listener: Callable[[dict], None]
+    ) -> Callable[[], None]:
+        """
+        Receive raw data of every streaming message of a command.
+
+        Taps see messages of all symbols and do not subscribe on their own; they observe
+        the subscriptions made with the `subscribe_*` methods.
+
+        Args:
+            command (str): Command name of streaming messages, e.g. "tickPrices" or "candle".
+            listener (Callable[[dict], None]): Callback receiving raw message data.
+
+        Returns:
+            Callable[[], None]: Function removing the tap.
+        """
+        self._dispatcher.add_tap(command, listener)
+        return lambda: self._dispatcher.remove_tap(command, listener)
+
     async def streaming_ping(self):
         """
         Send a streaming ping to maintain the streaming session.
@@ -913,6 +1687,19 @@ class Api:
             self._streaming_writer, "ping", streamSessionId=self._stream_session_id
         )
 
+    @property
+    def rate_limit_stats(self) -> dict[str, RateLimiterStats]:
+        """
+        Counters of the request rate limiters of both connections.
+
+        Returns:
+            dict[str, RateLimiterStats]: Stats keyed by "command" and "streaming".
+        """
+        return {
+            "command": self._command_limiter.stats,
+            "streaming": self._streaming_limiter.stats,
+        }
+
     async def is_logged_in(self) -> bool:
         """
         Verify if the user is currently logged in.
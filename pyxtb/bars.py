@@ -0,0 +1,323 @@
+import functools
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from typing import TYPE_CHECKING, Callable
+from zoneinfo import ZoneInfo
+
+from ._types import Period, StreamingCandleRecord, StreamingTickRecord, Time
+
+if TYPE_CHECKING:
+    from .api import Api
+
+_MINUTE = 60_000
+
+SERVER_TIMEZONE = "Europe/Prague"
+"Time zone of the trading server, chart bars are aligned to CET / CEST."
+
+
+@dataclass
+class Bar:
+    """
+    OHLC bar built from streamed prices
+    """
+
+    symbol: str
+    period: Period
+    ctm: Time
+    "Start of the bar in milliseconds"
+    end: Time
+    "Start of the next bar in milliseconds"
+    open: float
+    high: float
+    low: float
+    close: float
+    vol: float
+    "Volume summed from M1 candles, 0 for bars built from ticks only"
+    ticks: int
+    "Number of ticks or candle updates in the bar"
+    closed: bool = False
+
+
+@functools.cache
+def _zone_(timezone: str | tzinfo) -> tzinfo:
+    return ZoneInfo(timezone) if isinstance(timezone, str) else timezone
+
+
+def bar_start(
+    period: Period, timestamp: Time, timezone: str | tzinfo = SERVER_TIMEZONE
+) -> Time:
+    """
+    Start of the bar of a period containing a timestamp.
+
+    Bars are aligned in the local time of the server like the bars of
+    `getChartRangeRequest`: hourly bars to multiples of their length from local
+    midnight, daily bars to local midnight, weekly bars to Mondays and monthly bars to
+    calendar months, following daylight saving time. Bars shorter than an hour are
+    aligned in UTC.
+
+    Args:
+        period (Period): Chart period.
+        timestamp (Time): Time in milliseconds.
+        timezone (str | tzinfo, optional): Time zone bars are aligned in, a name or a `tzinfo`. Defaults to `SERVER_TIMEZONE`.
+
+    Returns:
+        Time: Bar start in milliseconds.
+    """
+    if period < Period.PERIOD_H1:
+        length = period * _MINUTE
+        return timestamp // length * length
+    moment = datetime.fromtimestamp(timestamp / 1000, _zone_(timezone))
+    if period == Period.PERIOD_MN1:
+        start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    elif period >= Period.PERIOD_D1:
+        start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        if period == Period.PERIOD_W1:
+            start -= timedelta(days=start.weekday())
+    else:
+        hours = period // 60
+        start = moment.replace(
+            hour=moment.hour // hours * hours, minute=0, second=0, microsecond=0
+        )
+    return int(start.timestamp() * 1000)
+
+
+def bar_end(
+    period: Period, start: Time, timezone: str | tzinfo = SERVER_TIMEZONE
+) -> Time:
+    """
+    Start of the bar following the bar starting at `start`.
+    """
+    if period < Period.PERIOD_H1:
+        return start + period * _MINUTE
+    moment = datetime.fromtimestamp(start / 1000, _zone_(timezone))
+    if period == Period.PERIOD_MN1:
+        year, month = divmod(moment.year * 12 + moment.month, 12)
+        following = moment.replace(year=year, month=month + 1)
+    else:
+        following = moment + timedelta(minutes=int(period))
+    return int(following.timestamp() * 1000)
+
+
+class BarBuilder:
+    """
+    Incremental builder of bars of every period from streamed ticks or M1 candles.
+
+    Each update touches only the in-progress bar of every period, so reading the
+    current partial bar with `current` is O(1). When a price arrives after the end of
+    the in-progress bar, or `advance` is called with a later time, the bar is closed,
+    appended to the completed bars and passed to `on_close`. Prices older than the
+    in-progress bar are ignored.
+
+    Examples:
+        >>> builder = BarBuilder(on_close=print)
+        >>> async with Api(1000000, "password") as api:
+        >>>     builder.attach(api)
+        >>>     await api.subscribe_tick_prices(lambda tick: None, "EURUSD")
+        >>>     ...
+        >>>     h1 = builder.current("EURUSD", Period.PERIOD_H1)
+    """
+
+    def __init__(
+        self,
+        periods: list[Period] | None = None,
+        on_close: Callable[[Bar], None] | None = None,
+        price: str = "bid",
+        timezone: str | tzinfo = SERVER_TIMEZONE,
+        history: int = 1000,
+    ):
+        """
+        Initialize BarBuilder object
+
+        Args:
+            periods (list[Period] | None, optional): Periods to build. Defaults to all periods.
+            on_close (Callable[[Bar], None] | None, optional): Callback receiving every closed bar. Defaults to None.
+            price (str, optional): Tick price used for bars, "bid", "ask" or "mid". Defaults to "bid".
+            timezone (str | tzinfo, optional): Time zone bars are aligned in, see `bar_start`. Defaults to `SERVER_TIMEZONE`.
+            history (int, optional): Number of closed bars kept for each symbol and period. Defaults to 1000.
+        """
+        self.periods = tuple(sorted(Period(period) for period in periods or Period))
+        self.on_close = on_close
+        self._price = price
+        self._timezone = _zone_(timezone)
+        self._history = history
+        self._current: dict[str, dict[Period, Bar]] = {}
+        self._closed: dict[tuple[str, Period], deque[Bar]] = {}
+        self._last_candle: dict[str, tuple[Time, float]] = {}
+
+    def current(self, symbol: str, period: Period) -> Bar | None:
+        """
+        In-progress bar of a symbol.
+
+        Args:
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+
+        Returns:
+            Bar | None: Partial bar or None if no price was received since the last bar closed.
+        """
+        bar = self._current.get(symbol, {}).get(period)
+        return None if bar is None or bar.closed else bar
+
+    def bars(self, symbol: str, period: Period) -> list[Bar]:
+        """
+        Closed bars of a symbol, oldest first.
+
+        Args:
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+
+        Returns:
+            list[Bar]: Up to `history` closed bars.
+        """
+        return list(self._closed.get((symbol, period), ()))
+
+    def _close_(self, bar: Bar):
+        bar.closed = True
+        key = (bar.symbol, bar.period)
+        if key not in self._closed:
+            self._closed[key] = deque(maxlen=self._history)
+        self._closed[key].append(bar)
+        if self.on_close:
+            self.on_close(bar)
+
+    def _update_(
+        self,
+        symbol: str,
+        timestamp: Time,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        vol: float,
+    ):
+        bars = self._current.get(symbol)
+        if bars is None:
+            bars = self._current[symbol] = {}
+        for period in self.periods:
+            bar = bars.get(period)
+            if bar is not None and timestamp < bar.end:
+                if timestamp < bar.ctm or bar.closed:
+                    continue
+                if high > bar.high:
+                    bar.high = high
+                if low < bar.low:
+                    bar.low = low
+                bar.close = close
+                bar.vol += vol
+                bar.ticks += 1
+                continue
+            if bar is not None and not bar.closed:
+                self._close_(bar)
+            start = bar_start(period, timestamp, self._timezone)
+            bars[period] = Bar(
+                symbol=symbol,
+                period=period,
+                ctm=start,
+                end=bar_end(period, start, self._timezone),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                vol=vol,
+                ticks=1,
+            )
+
+    def update_tick(self, tick: StreamingTickRecord):
+        """
+        Apply a streamed tick. Ticks of depth levels other than 0 are ignored.
+
+        Args:
+            tick (StreamingTickRecord): Streamed tick.
+        """
+        self._on_tick_(
+            {
+                "symbol": tick.symbol,
+                "level": tick.level,
+                "timestamp": tick.timestamp,
+                "bid": tick.bid,
+                "ask": tick.ask,
+            }
+        )
+
+    def _on_tick_(self, tick: dict):
+        if tick.get("level"):
+            return
+        if self._price == "mid":
+            price = (tick["bid"] + tick["ask"]) / 2
+        else:
+            price = tick[self._price]
+        self._update_(tick["symbol"], tick["timestamp"], price, price, price, price, 0)
+
+    def update_candle(self, candle: StreamingCandleRecord):
+        """
+        Apply a streamed M1 candle.
+
+        A candle with the same time as the previous candle of its symbol is treated as
+        an update of it, its volume replaces the volume of the previous one.
+
+        Args:
+            candle (StreamingCandleRecord): Streamed M1 candle.
+        """
+        self._on_candle_(
+            {
+                "symbol": candle.symbol,
+                "ctm": candle.ctm,
+                "open": candle.open,
+                "high": candle.high,
+                "low": candle.low,
+                "close": candle.close,
+                "vol": candle.vol,
+            }
+        )
+
+    def _on_candle_(self, candle: dict):
+        symbol, ctm, vol = candle["symbol"], candle["ctm"], candle["vol"]
+        last_ctm, last_vol = self._last_candle.get(symbol, (None, 0.0))
+        if last_ctm is not None and ctm < last_ctm:
+            return
+        if ctm == last_ctm:
+            vol -= last_vol
+        self._last_candle[symbol] = (ctm, candle["vol"])
+        self._update_(
+            symbol,
+            ctm,
+            candle["open"],
+            candle["high"],
+            candle["low"],
+            candle["close"],
+            vol,
+        )
+
+    def advance(self, timestamp: Time):
+        """
+        Close all in-progress bars ending at or before a time.
+
+        Call it periodically with the server time to close bars of symbols without
+        new prices.
+
+        Args:
+            timestamp (Time): Current server time in milliseconds.
+        """
+        for bars in self._current.values():
+            for bar in bars.values():
+                if bar.end <= timestamp and not bar.closed:
+                    self._close_(bar)
+
+    def attach(self, api: "Api", source: str = "ticks") -> Callable[[], None]:
+        """
+        Build bars from streaming messages received by an `Api`.
+
+        The builder only observes messages, symbols have to be subscribed with
+        `subscribe_tick_prices` or `subscribe_get_candles`.
+
+        Args:
+            api (Api): API connector to observe.
+            source (str, optional): "ticks" or "candles". Defaults to "ticks".
+
+        Returns:
+            Callable[[], None]: Function detaching the builder.
+        """
+        if source == "candles":
+            return api.tap_stream("candle", self._on_candle_)
+        return api.tap_stream("tickPrices", self._on_tick_)
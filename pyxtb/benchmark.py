@@ -0,0 +1,368 @@
+"""
+Load benchmarks of `Api` against a local `XapiEmulator`.
+
+Every scenario runs in a fresh process talking to an emulator in another process, so
+CPU time and peak RSS belong to the client only. Results are printed as JSON and can be
+compared with a previous run:
+
+    python -m pyxtb.benchmark --output current.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from importlib import metadata
+from multiprocessing import get_context
+
+from .api import Api
+
+
+@dataclass
+class Scenario:
+    """
+    Parameters of a benchmark scenario
+    """
+
+    name: str
+    "Unique name of the scenario in the report"
+    kind: str
+    "One of `ticks`, `commands`, `mixed` or `symbols`"
+    symbols: int = 1
+    "Number of streamed symbols"
+    tick_rate: float = 0.0
+    "Ticks per second of each streamed symbol"
+    duration: float = 5.0
+    "Seconds of streaming"
+    command: str = "getVersion"
+    "Command sent by the command load"
+    commands: int = 0
+    "Number of commands sent"
+    concurrency: int = 1
+    "Commands in flight at once"
+    symbol_count: int = 0
+    "Synthetic symbols added to the emulator, they make `getAllSymbols` larger"
+    request_interval: float = 0.0
+    "Rate limiter spacing of the client, 0 disables rate limiting"
+
+
+SCENARIOS = [
+    Scenario("ticks-10x100", "ticks", symbols=10, tick_rate=100),
+    Scenario("ticks-50x200", "ticks", symbols=50, tick_rate=200),
+    Scenario("commands-c1", "commands", commands=2000, concurrency=1),
+    Scenario("commands-c32", "commands", commands=5000, concurrency=32),
+    Scenario(
+        "mixed",
+        "mixed",
+        symbols=20,
+        tick_rate=100,
+        commands=2000,
+        concurrency=16,
+    ),
+    Scenario(
+        "all-symbols-5000",
+        "symbols",
+        command="getAllSymbols",
+        commands=20,
+        symbol_count=5000,
+    ),
+]
+"Default scenarios of a benchmark run."
+
+
+@dataclass
+class Measurement:
+    """
+    Results of one benchmark scenario
+    """
+
+    scenario: dict
+    tick_count: int = 0
+    "Number of received ticks"
+    tick_throughput: float = 0.0
+    "Received ticks per second of streaming"
+    command_count: int = 0
+    "Number of answered commands"
+    command_throughput: float = 0.0
+    "Answered commands per second of the command load"
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    "Command round trip times, p50/p99/p999/max"
+    tick_lag_ms: dict[str, float] = field(default_factory=dict)
+    "Time from tick creation by the server to the listener call, p50/p99/p999/max"
+    offered_ticks: float = 0.0
+    "Ticks sent by the emulator for the scenario"
+    wall_time_s: float = 0.0
+    cpu_time_s: float = 0.0
+    "Client process CPU time, user and system"
+    peak_rss_kb: int = 0
+    "Peak resident set size of the client process"
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """
+    Nearest-rank p50, p99, p999 and max of samples.
+
+    Args:
+        samples (list[float]): Samples in any order.
+
+    Returns:
+        dict[str, float]: Percentiles keyed by name, empty without samples.
+    """
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(quantile: float) -> float:
+        return ordered[max(math.ceil(quantile * len(ordered)) - 1, 0)]
+
+    return {
+        "p50": rank(0.5),
+        "p99": rank(0.99),
+        "p999": rank(0.999),
+        "max": ordered[-1],
+    }
+
+
+def _free_port_() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_port_(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return
+
+
+async def _tick_load_(api: Api, scenario: Scenario, lags: list[float]) -> int:
+    received = 0
+
+    def on_tick(tick):
+        nonlocal received
+        received += 1
+        lags.append(time.time() * 1000 - tick.timestamp)
+
+    unsubscribes = [
+        await api.subscribe_tick_prices(on_tick, f"SYM{index:05d}")
+        for index in range(scenario.symbols)
+    ]
+    await asyncio.sleep(scenario.duration)
+    for unsubscribe in unsubscribes:
+        await unsubscribe()
+    return received
+
+
+async def _command_load_(api: Api, scenario: Scenario, latencies: list[float]) -> int:
+    remaining = iter(range(scenario.commands))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await api._send_and_read_command_(scenario.command, None, as_json=True)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    return len(latencies)
+
+
+async def _timed_(load) -> tuple[int, float]:
+    if load is None:
+        return 0, 0.0
+    start = time.perf_counter()
+    count = await load
+    return count, time.perf_counter() - start
+
+
+async def _measure_(scenario: Scenario) -> Measurement:
+    port, streaming_port = _free_port_(), _free_port_()
+    emulator = subprocess.Popen(
+        [
+            *(sys.executable, "-m", "pyxtb.emulator"),
+            *("--port", str(port), "--streaming-port", str(streaming_port)),
+            *("--tick-rate", str(scenario.tick_rate)),
+            *("--symbol-count", str(max(scenario.symbol_count, scenario.symbols))),
+            *("--seed", "0"),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    measurement = Measurement(scenario=asdict(scenario))
+    try:
+        await _wait_for_port_(port)
+        await _wait_for_port_(streaming_port)
+        async with Api(
+            0,
+            "benchmark",
+            address="127.0.0.1",
+            ssl=False,
+            port=port,
+            streaming_port=streaming_port,
+            request_interval=scenario.request_interval,
+        ) as api:
+            lags: list[float] = []
+            latencies: list[float] = []
+            tick_load = command_load = None
+            if scenario.kind in ("ticks", "mixed"):
+                tick_load = _tick_load_(api, scenario, lags)
+            if scenario.kind in ("commands", "mixed", "symbols"):
+                command_load = _command_load_(api, scenario, latencies)
+
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            (tick_count, tick_time), (command_count, command_time) = (
+                await asyncio.gather(_timed_(tick_load), _timed_(command_load))
+            )
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+
+        measurement.tick_count = tick_count
+        measurement.tick_throughput = tick_count / tick_time if tick_count else 0.0
+        measurement.command_count = command_count
+        measurement.command_throughput = (
+            command_count / command_time if command_count else 0.0
+        )
+        measurement.wall_time_s = wall_time
+        measurement.cpu_time_s = cpu_time
+        measurement.latency_ms = percentiles(latencies)
+        measurement.tick_lag_ms = percentiles(lags)
+        measurement.offered_ticks = scenario.symbols * scenario.tick_rate * (
+            scenario.duration if scenario.kind in ("ticks", "mixed") else 0
+        )
+        measurement.peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finally:
+        emulator.terminate()
+        emulator.wait()
+    return measurement
+
+
+def _run_scenario_(scenario: Scenario) -> dict:
+    return asdict(asyncio.run(_measure_(scenario)))
+
+
+def run(scenarios: list[Scenario] = SCENARIOS) -> dict:
+    """
+    Run scenarios one by one, each in a fresh process.
+
+    Args:
+        scenarios (list[Scenario], optional): Scenarios to run. Defaults to `SCENARIOS`.
+
+    Returns:
+        dict: Machine-readable report with environment details and measurements.
+    """
+    results = []
+    for scenario in scenarios:
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            results.append(executor.submit(_run_scenario_, scenario).result())
+    try:
+        version = metadata.version("pyxtb")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "pyxtb": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.1) -> list[str]:
+    """
+    Find regressions of a report against a baseline report.
+
+    Tick or command throughput lower, or p99 latency, CPU time or peak RSS higher than the baseline by
+    more than `tolerance` is a regression.
+
+    Args:
+        report (dict): Current report from `run`.
+        baseline (dict): Previous report from `run`.
+        tolerance (float, optional): Allowed relative change. Defaults to 0.1.
+
+    Returns:
+        list[str]: Descriptions of regressions.
+    """
+    previous = {result["scenario"]["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        name = result["scenario"]["name"]
+        if name not in previous:
+            continue
+        checks = [
+            (metric, result[metric], previous[name].get(metric), -1)
+            for metric in ("tick_throughput", "command_throughput")
+        ]
+        checks += [
+            ("cpu_time_s", result["cpu_time_s"], previous[name]["cpu_time_s"], 1),
+            ("peak_rss_kb", result["peak_rss_kb"], previous[name]["peak_rss_kb"], 1),
+        ]
+        for metric in ("latency_ms", "tick_lag_ms"):
+            if result[metric] and previous[name][metric]:
+                checks.append(
+                    (
+                        f"{metric}.p99",
+                        result[metric]["p99"],
+                        previous[name][metric]["p99"],
+                        1,
+                    )
+                )
+        for metric, current, before, direction in checks:
+            if before and (current - before) / before * direction > tolerance:
+                regressions.append(f"{name}: {metric} {before:.4g} -> {current:.4g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="scenario to run, may be repeated, defaults to all",
+    )
+    parser.add_argument("--duration", type=float, help="override streaming duration")
+    parser.add_argument("--output", help="file to write the JSON report to")
+    parser.add_argument("--baseline", help="previous JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenario or scenario.name in args.scenario
+    ]
+    if args.duration is not None:
+        scenarios = [replace(scenario, duration=args.duration) for scenario in scenarios]
+
+    report = run(scenarios)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
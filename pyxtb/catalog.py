@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from ._codec import decode
+from ._types import SymbolRecord
+from .api import Api
+
+DEFAULT_TTL = 6 * 60 * 60
+"Default time after which the catalog is downloaded again, in seconds."
+
+
+class SymbolCatalog:
+    """
+    In-memory catalog of symbol metadata.
+
+    Hydrates from a single `getAllSymbols` call and answers symbol lookups from memory.
+    With `path` set, the catalog is persisted to disk and a fresh enough copy is loaded
+    on start instead of calling the server. The catalog is downloaded again once `ttl`
+    expires or when `refresh` is called. Symbols missing from the catalog are fetched
+    with `getSymbol` and added to it.
+
+    Examples:
+        >>> async with Api(1000000, "password") as api:
+        >>>     catalog = SymbolCatalog(api, path="symbols.json")
+        >>>     trades = await api.get_trades(openedOnly=True)
+        >>>     symbols = await catalog.get_symbols([trade.symbol for trade in trades])
+    """
+
+    def __init__(
+        self,
+        api: Api,
+        path: str | os.PathLike | None = None,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """
+        Initialize SymbolCatalog object
+
+        Args:
+            api (Api): API connector used to download symbols.
+            path (str | os.PathLike | None, optional): File the catalog is persisted to. Defaults to None.
+            ttl (float, optional): Seconds after which the catalog is downloaded again. Defaults to 6 hours.
+        """
+        self.api = api
+        self._path = Path(path) if path else None
+        self._ttl = ttl
+        self._symbols: dict[str, SymbolRecord] = {}
+        self._fetched: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the catalog has to be downloaded again.
+        """
+        return self._fetched is None or time.time() - self._fetched > self._ttl
+
+    def _load_(self) -> tuple[float, list[dict]] | None:
+        if not self._path or not self._path.exists():
+            return None
+        data = json.loads(self._path.read_text())
+        return data["fetched"], data["symbols"]
+
+    def _save_(self, fetched: float, symbols: list[dict]):
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"fetched": fetched, "symbols": symbols}))
+        os.replace(tmp_path, self._path)
+
+    def _hydrate_(self, fetched: float, symbols: list[dict]):
+        self._symbols = {
+            symbol.symbol: symbol for symbol in decode(SymbolRecord, symbols)
+        }
+        self._fetched = fetched
+
+    async def refresh(self):
+        """
+        Download all symbols from the server and persist them.
+        """
+        async with self._lock:
+            await self._refresh_()
+
+    async def _refresh_(self):
+        symbols = await self.api.get_all_symbols(as_json=True)
+        fetched = time.time()
+        self._hydrate_(fetched, symbols)
+        if self._path:
+            await asyncio.to_thread(self._save_, fetched, symbols)
+
+    async def _ensure_fresh_(self):
+        if not self.expired:
+            return
+        async with self._lock:
+            if not self.expired:
+                return
+            if self._fetched is None:
+                stored = await asyncio.to_thread(self._load_)
+                if stored and time.time() - stored[0] <= self._ttl:
+                    self._hydrate_(*stored)
+                    return
+            await self._refresh_()
+
+    async def get_symbol(self, symbol: str) -> SymbolRecord:
+        """
+        Look up a single symbol.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            SymbolRecord: Symbol metadata.
+        """
+        await self._ensure_fresh_()
+        if symbol not in self._symbols:
+            self._symbols[symbol] = await self.api.get_symbol(symbol)
+        return self._symbols[symbol]
+
+    async def get_symbols(self, symbols: list[str]) -> list[SymbolRecord]:
+        """
+        Look up many symbols at once.
+
+        Args:
+            symbols (list[str]): Symbol names.
+
+        Returns:
+            list[SymbolRecord]: Symbol metadata in the order of `symbols`.
+        """
+        await self._ensure_fresh_()
+        missing = list(
+            dict.fromkeys(symbol for symbol in symbols if symbol not in self._symbols)
+        )
+        if missing:
+            records = await asyncio.gather(
+                *(self.api.get_symbol(symbol) for symbol in missing)
+            )
+            self._symbols.update(zip(missing, records))
+        return [self._symbols[symbol] for symbol in symbols]
+
+    async def get_all_symbols(self) -> list[SymbolRecord]:
+        """
+        All symbols in the catalog.
+
+        Returns:
+            list[SymbolRecord]: Symbol metadata.
+        """
+        await self._ensure_fresh_()
+        return list(self._symbols.values())
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ._types import ChartResponseRecord
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+RATE_INFO_FIELDS = ("ctm", "open", "high", "low", "close", "vol")
+"Order of columns in raw chart arrays."
+
+
+def _require_numpy_():
+    if np is None:
+        raise ImportError(
+            "numpy is required for columnar chart data, install pyxtb[numpy]"
+        )
+
+
+@dataclass
+class ChartFrame:
+    """
+    Columnar chart data decoded to real prices.
+
+    xAPI sends `open` in price units multiplied by 10 to the power of `digits` and
+    `high`, `low` and `close` as offsets from `open`. ChartFrame holds every column as
+    a contiguous NumPy array with prices already scaled and reconstructed.
+    """
+
+    digits: int
+    "Number of decimal places"
+    ctm: "ndarray"
+    "Candle start time in CET / CEST time zone, int64 milliseconds"
+    open: "ndarray"
+    "Open prices, float64"
+    high: "ndarray"
+    "Highest prices, float64"
+    low: "ndarray"
+    "Lowest prices, float64"
+    close: "ndarray"
+    "Close prices, float64"
+    vol: "ndarray"
+    "Volumes in lots, float64"
+
+    def __len__(self) -> int:
+        return len(self.ctm)
+
+    @classmethod
+    def from_raw(cls, digits: int, rates: "ndarray") -> "ChartFrame":
+        """
+        Build a frame from raw xAPI values.
+
+        Args:
+            digits (int): Number of decimal places.
+            rates (ndarray): Array of shape (n, 6) with columns ctm, open, high, low, close, vol
+                in the encoding sent by the server.
+
+        Returns:
+            ChartFrame: Decoded frame.
+        """
+        _require_numpy_()
+        rates = np.asarray(rates, dtype=np.float64).reshape(-1, len(RATE_INFO_FIELDS))
+        prices = rates[:, 1:5].copy()
+        prices[:, 1:] += prices[:, :1]
+        prices = np.round(prices * 10.0**-digits, digits)
+        return cls(
+            digits=digits,
+            ctm=rates[:, 0].astype(np.int64),
+            open=np.ascontiguousarray(prices[:, 0]),
+            high=np.ascontiguousarray(prices[:, 1]),
+            low=np.ascontiguousarray(prices[:, 2]),
+            close=np.ascontiguousarray(prices[:, 3]),
+            vol=np.ascontiguousarray(rates[:, 5]),
+        )
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ChartFrame":
+        """
+        Build a frame from a raw `getChartLastRequest` / `getChartRangeRequest` response.
+
+        Args:
+            data (dict): Response data with `digits` and `rateInfos`.
+
+        Returns:
+            ChartFrame: Decoded frame.
+        """
+        _require_numpy_()
+        rates = np.array(
+            [[rate[field] for field in RATE_INFO_FIELDS] for rate in data["rateInfos"]],
+            dtype=np.float64,
+        )
+        return cls.from_raw(data["digits"], rates)
+
+    @classmethod
+    def from_record(cls, record: ChartResponseRecord) -> "ChartFrame":
+        """
+        Build a frame from a decoded chart response.
+
+        Args:
+            record (ChartResponseRecord): Chart response record.
+
+        Returns:
+            ChartFrame: Decoded frame.
+        """
+        _require_numpy_()
+        rates = np.array(
+            [
+                [getattr(rate, field) for field in RATE_INFO_FIELDS]
+                for rate in record.rateInfos
+            ],
+            dtype=np.float64,
+        )
+        return cls.from_raw(record.digits, rates)
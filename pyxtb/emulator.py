@@ -0,0 +1,744 @@
+"""
+Local stand-in for the xAPI command and streaming servers.
+
+Run `python -m pyxtb.emulator` to start it on the demo ports of localhost and connect
+with `Api(login, password, address="localhost", ssl=False)`.
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import ssl
+import subprocess
+import tempfile
+import time
+import uuid
+import zlib
+from asyncio import StreamReader, StreamWriter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from ._protocol import (
+    encode_frame,
+    parse_stream_request,
+    read_requests,
+    track_connection,
+)
+from .api import Api
+from .errors import CODES
+from .history import MAX_CANDLES
+
+DEFAULT_SYMBOLS = {
+    "EURUSD": (1.08, 5),
+    "GBPUSD": (1.27, 5),
+    "USDJPY": (150.0, 3),
+    "US500": (5000.0, 2),
+    "DE40": (18000.0, 2),
+    "GOLD": (2300.0, 2),
+}
+"Symbols quoted by default as symbol: (starting price, digits)."
+
+Handler = Callable[[dict], Any]
+"Command handler receiving the request `arguments` and returning `returnData`."
+
+
+class EmulatorError(Exception):
+    """
+    Raised by command handlers to reply with an xAPI error code.
+    """
+
+    def __init__(self, code: str, description: str | None = None):
+        super().__init__(description or CODES.get(code, code))
+        self.code = code
+
+
+def self_signed_context(
+    host: str = "localhost", directory: str | None = None
+) -> tuple[ssl.SSLContext, ssl.SSLContext]:
+    """
+    Create a self-signed certificate with the `openssl` command line tool.
+
+    Args:
+        host (str, optional): Host name of the certificate. Defaults to "localhost".
+        directory (str | None, optional): Directory for the certificate and key. Defaults to a temporary directory.
+
+    Returns:
+        tuple[SSLContext, SSLContext]: Server context and a client context trusting the certificate.
+    """
+    path = Path(directory or tempfile.mkdtemp(prefix="pyxtb-"))
+    cert, key = path / "emulator.crt", path / "emulator.key"
+    subprocess.run(
+        [
+            *("openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes"),
+            *("-days", "1", "-subj", f"/CN={host}"),
+            *("-addext", f"subjectAltName=DNS:{host},IP:127.0.0.1"),
+            *("-keyout", str(key), "-out", str(cert)),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    server = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server.load_cert_chain(cert, key)
+    return server, ssl.create_default_context(cafile=cert)
+
+
+class _Session:
+    def __init__(self, login: int):
+        self.login = login
+        self.stream_session_id = uuid.uuid4().hex
+        self.streams: set["_Stream"] = set()
+
+
+class _Stream:
+    def __init__(self, writer: StreamWriter):
+        self.writer = writer
+        self.tasks: dict[tuple[str, str | None], asyncio.Task] = {}
+
+    def send(self, command: str, data: dict):
+        self.writer.write(encode_frame({"command": command, "data": data}))
+
+    def close(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+
+class XapiEmulator:
+    """
+    Local emulator of the xAPI command and streaming protocols.
+
+    Accepts logins, answers the common commands with generated data and streams ticks,
+    candles, trades, profits, balance and keep alive messages at configurable rates.
+    Prices of every symbol follow a random walk shared by commands and streams. Chart
+    bars are generated from the symbol and bar time only, so repeated requests return
+    the same bars. Handlers of any command can be replaced or added with `responses`.
+
+    Examples:
+        >>> async with XapiEmulator(port=0, streaming_port=0) as emulator:
+        >>>     async with Api(1000000, "password", **emulator.api_kwargs) as api:
+        >>>         symbols = await api.get_all_symbols()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = Api._DEMO.port,
+        streaming_port: int = Api._DEMO.streaming,
+        tls: bool | ssl.SSLContext = False,
+        symbols: dict[str, tuple[float, int]] | None = None,
+        accounts: dict[int, str] | None = None,
+        responses: dict[str, Any] | None = None,
+        tick_rate: float = 10.0,
+        candle_interval: float = 60.0,
+        trade_rate: float = 1.0,
+        latency: float = 0.0,
+        seed: int | None = None,
+    ):
+        """
+        Initialize XapiEmulator object
+
+        Args:
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Command port, 0 picks a free port. Defaults to the demo port.
+            streaming_port (int, optional): Streaming port, 0 picks a free port. Defaults to the demo streaming port.
+            tls (bool | SSLContext, optional): Server TLS context, True for a generated self-signed certificate. Defaults to plain TCP.
+            symbols (dict[str, tuple[float, int]] | None, optional): Quoted symbols as symbol: (starting price, digits). Defaults to `DEFAULT_SYMBOLS`.
+            accounts (dict[int, str] | None, optional): Accepted logins and passwords. Defaults to accepting any login.
+            responses (dict[str, Any] | None, optional): Canned `returnData` or handlers keyed by command. Defaults to None.
+            tick_rate (float, optional): Ticks per second streamed for each subscribed symbol. Defaults to 10.
+            candle_interval (float, optional): Seconds between streamed candles of a symbol. Defaults to 60.
+            trade_rate (float, optional): Trade, profit and balance messages per second. Defaults to 1.
+            latency (float, optional): Seconds each command reply is delayed by. Defaults to 0.
+            seed (int | None, optional): Seed of the price random walk. Defaults to None.
+        """
+        self.host = host
+        self.port = port
+        self.streaming_port = streaming_port
+        self._ssl_context, self._client_ssl_context = (
+            self_signed_context(host) if tls is True else (tls or None, tls is not False)
+        )
+        self._accounts = accounts
+        self.tick_rate = tick_rate
+        self.candle_interval = candle_interval
+        self.trade_rate = trade_rate
+        self.latency = latency
+        self._random = random.Random(seed)
+        self._symbols = dict(symbols or DEFAULT_SYMBOLS)
+        self._prices = {symbol: price for symbol, (price, _) in self._symbols.items()}
+        self._sessions: dict[str, _Session] = {}
+        self._trades: dict[int, dict] = {}
+        self._orders = itertools.count(1)
+        self._servers: list[asyncio.Server] = []
+        self._connections: set[asyncio.Task] = set()
+        self.requests = 0
+        "Number of commands answered on the command connections."
+        self._handlers: dict[str, Handler] = {
+            "getAllSymbols": lambda _: [
+                self._symbol_record_(symbol) for symbol in self._symbols
+            ],
+            "getSymbol": lambda arguments: self._symbol_record_(arguments["symbol"]),
+            "getServerTime": lambda _: {
+                "time": self._now_(),
+                "timeString": datetime.now(timezone.utc).isoformat(),
+            },
+            "getVersion": lambda _: {"version": "2.5.0"},
+            "ping": lambda _: None,
+            "getCurrentUserData": lambda _: {
+                "companyUnit": 8,
+                "currency": "EUR",
+                "group": "demoEUR",
+                "ibAccount": False,
+                "leverage": 1,
+                "leverageMultiplier": 0.25,
+                "spreadType": "FLOAT",
+                "trailingStop": False,
+            },
+            "getMarginLevel": lambda _: self._margin_level_(),
+            "getTickPrices": self._tick_prices_,
+            "getChartLastRequest": self._chart_last_,
+            "getChartRangeRequest": self._chart_range_,
+            "getTrades": lambda arguments: [
+                trade
+                for trade in self._trades.values()
+                if not trade["closed"] or not arguments.get("openedOnly")
+            ],
+            "getTradeRecords": lambda arguments: [
+                self._trades[order]
+                for order in arguments["orders"]
+                if order in self._trades
+            ],
+            "getTradesHistory": lambda _: [
+                trade for trade in self._trades.values() if trade["closed"]
+            ],
+            "getCalendar": lambda _: [],
+            "getNews": lambda _: [],
+            "getStepRules": lambda _: [],
+            "getTradingHours": lambda _: [],
+            "tradeTransaction": self._trade_transaction_,
+            "tradeTransactionStatus": self._trade_status_,
+        }
+        for command, response in (responses or {}).items():
+            self._handlers[command] = (
+                response if callable(response) else lambda _, data=response: data
+            )
+
+    @property
+    def api_kwargs(self) -> dict:
+        """
+        Keyword arguments connecting an `Api` to this emulator.
+        """
+        return {
+            "address": self.host,
+            "port": self.port,
+            "streaming_port": self.streaming_port,
+            "ssl": self._client_ssl_context,
+        }
+
+    async def start(self):
+        """
+        Start listening on the command and streaming ports.
+        """
+        for handler, port in (
+            (self._serve_commands_, self.port),
+            (self._serve_streaming_, self.streaming_port),
+        ):
+            server = await asyncio.start_server(
+                track_connection(handler, self._connections), self.host, port, ssl=self._ssl_context
+            )
+            self._servers.append(server)
+        self.port, self.streaming_port = (
+            server.sockets[0].getsockname()[1] for server in self._servers
+        )
+
+    async def close(self):
+        """
+        Stop the servers and close all client connections.
+        """
+        for server in self._servers:
+            server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+
+    async def drop_connections(self):
+        """
+        Close all client connections while keeping the servers listening, e.g. to test
+        reconnects.
+        """
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def serve_forever(self):
+        """
+        Start the emulator and serve until cancelled.
+        """
+        await self.start()
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in self._servers))
+        finally:
+            await self.close()
+
+    @staticmethod
+    def _now_() -> int:
+        return int(time.time() * 1000)
+
+    def _step_(self, symbol: str) -> float:
+        price, digits = self._prices[symbol], self._symbols[symbol][1]
+        price *= math.exp(self._random.gauss(0, 0.0002))
+        self._prices[symbol] = price
+        return round(price, digits)
+
+    def _quote_(self, symbol: str) -> tuple[float, float]:
+        if symbol not in self._symbols:
+            raise EmulatorError("BE115")
+        digits = self._symbols[symbol][1]
+        bid = round(self._prices[symbol], digits)
+        return bid, round(bid + 10 * 10**-digits, digits)
+
+    def _symbol_record_(self, symbol: str) -> dict:
+        bid, ask = self._quote_(symbol)
+        digits = self._symbols[symbol][1]
+        forex = digits in (3, 5)
+        return {
+            "ask": ask,
+            "bid": bid,
+            "categoryName": "FX" if forex else "IND",
+            "contractSize": 100000 if forex else 10,
+            "currency": symbol[:3] if forex else "USD",
+            "currencyPair": forex,
+            "currencyProfit": symbol[3:] if forex else "USD",
+            "description": symbol,
+            "expiration": None,
+            "groupName": "Emulated",
+            "high": ask,
+            "initialMargin": 0,
+            "instantMaxVolume": 0,
+            "leverage": 3.33,
+            "longOnly": False,
+            "lotMax": 100.0,
+            "lotMin": 0.01,
+            "lotStep": 0.01,
+            "low": bid,
+            "marginHedged": 0,
+            "marginHedgedStrong": False,
+            "marginMaintenance": None,
+            "marginMode": 101 if forex else 103,
+            "percentage": 100.0,
+            "pipsPrecision": digits - 1,
+            "precision": digits,
+            "profitMode": 5 if forex else 6,
+            "quoteId": 1,
+            "shortSelling": True,
+            "spreadRaw": round(ask - bid, digits),
+            "spreadTable": 1.0,
+            "starting": None,
+            "stepRuleId": 1,
+            "stopsLevel": 0,
+            "swap_rollover3days": 0,
+            "swapEnable": True,
+            "swapLong": -1.0,
+            "swapShort": -1.0,
+            "swapType": 1,
+            "symbol": symbol,
+            "tickSize": 10**-digits,
+            "tickValue": 1.0,
+            "time": self._now_(),
+            "timeString": datetime.now(timezone.utc).isoformat(),
+            "trailingEnabled": True,
+            "type": 21,
+        }
+
+    def _margin_level_(self) -> dict:
+        profit = sum(trade["profit"] or 0 for trade in self._trades.values())
+        return {
+            "balance": 10000.0,
+            "credit": 0.0,
+            "currency": "EUR",
+            "equity": 10000.0 + profit,
+            "margin": 0.0,
+            "margin_free": 10000.0 + profit,
+            "margin_level": 0.0,
+        }
+
+    def _tick_record_(self, symbol: str, level: int = 0) -> dict:
+        bid, ask = self._quote_(symbol)
+        digits = self._symbols[symbol][1]
+        return {
+            "ask": ask,
+            "askVolume": 1000 * (level + 1),
+            "bid": bid,
+            "bidVolume": 1000 * (level + 1),
+            "high": ask,
+            "level": level,
+            "low": bid,
+            "quoteId": 1,
+            "spreadRaw": round(ask - bid, digits),
+            "spreadTable": 1.0,
+            "symbol": symbol,
+            "timestamp": self._now_(),
+        }
+
+    def _tick_prices_(self, arguments: dict) -> dict:
+        return {
+            "quotations": [
+                self._tick_record_(symbol, level)
+                for symbol in arguments["symbols"]
+                for level in range(max(arguments.get("level", 0), 0) + 1)
+            ]
+        }
+
+    def _bar_(self, symbol: str, ctm: int) -> dict:
+        """
+        Bar of a symbol at `ctm` in the encoding of chart responses.
+        """
+        price, digits = self._symbols[symbol]
+        bar_random = random.Random(zlib.crc32(f"{symbol}:{ctm}".encode()))
+        scale = 10**digits
+        open_ = round(price * (1 + bar_random.uniform(-0.01, 0.01)) * scale)
+        close = round(price * bar_random.uniform(-0.001, 0.001) * scale)
+        high = max(close, 0) + round(price * bar_random.uniform(0, 0.001) * scale)
+        low = min(close, 0) - round(price * bar_random.uniform(0, 0.001) * scale)
+        return {
+            "close": float(close),
+            "ctm": ctm,
+            "ctmString": "",
+            "high": float(high),
+            "low": float(low),
+            "open": float(open_),
+            "vol": float(bar_random.randint(1, 1000)),
+        }
+
+    def _chart_(self, symbol: str, period: int, start: int, end: int) -> dict:
+        if symbol not in self._symbols:
+            raise EmulatorError("BE115")
+        step = period * 60_000
+        if (end - start) // step > MAX_CANDLES:
+            raise EmulatorError("EX009")
+        first = -(-start // step) * step
+        return {
+            "digits": self._symbols[symbol][1],
+            "rateInfos": [self._bar_(symbol, ctm) for ctm in range(first, end, step)],
+        }
+
+    def _chart_last_(self, arguments: dict) -> dict:
+        info = arguments["info"]
+        return self._chart_(info["symbol"], info["period"], info["start"], self._now_())
+
+    def _chart_range_(self, arguments: dict) -> dict:
+        info = arguments["info"]
+        return self._chart_(info["symbol"], info["period"], info["start"], info["end"])
+
+    def _trade_transaction_(self, arguments: dict) -> dict:
+        info = arguments["tradeTransInfo"]
+        symbol = info["symbol"]
+        bid, ask = self._quote_(symbol)
+        order = next(self._orders)
+        trade_type = info.get("type", 0)
+        if trade_type == 0:
+            price = ask if info.get("cmd", 0) == 0 else bid
+            self._trades[order] = {
+                "close_price": price,
+                "close_time": None,
+                "close_timeString": None,
+                "closed": False,
+                "cmd": info.get("cmd", 0),
+                "comment": "",
+                "commission": 0.0,
+                "customComment": info.get("customComment"),
+                "digits": self._symbols[symbol][1],
+                "expiration": None,
+                "expirationString": None,
+                "margin_rate": 0.0,
+                "offset": 0,
+                "open_price": price,
+                "open_time": self._now_(),
+                "open_timeString": "",
+                "order": order,
+                "order2": order,
+                "position": order,
+                "profit": 0.0,
+                "sl": info.get("sl", 0.0),
+                "storage": 0.0,
+                "symbol": symbol,
+                "timestamp": self._now_(),
+                "tp": info.get("tp", 0.0),
+                "volume": info.get("volume", 0.0),
+            }
+        elif trade_type == 2 and info.get("order") in self._trades:
+            trade = self._trades[info["order"]]
+            trade.update(closed=True, close_time=self._now_(), close_price=bid)
+        status = {
+            "customComment": info.get("customComment"),
+            "message": None,
+            "order": order,
+            "price": ask,
+            "requestStatus": 3,
+        }
+        for session in self._sessions.values():
+            for stream in session.streams:
+                if ("tradeStatus", None) in stream.tasks:
+                    stream.send("tradeStatus", status)
+        return {"order": order}
+
+    def _trade_status_(self, arguments: dict) -> dict:
+        order = arguments["order"]
+        trade = self._trades.get(order)
+        bid, ask = self._quote_(trade["symbol"]) if trade else (0.0, 0.0)
+        return {
+            "ask": ask,
+            "bid": bid,
+            "customComment": trade["customComment"] if trade else None,
+            "message": None,
+            "order": order,
+            "requestStatus": 3,
+        }
+
+    def _reply_(self, request: dict, session: _Session | None) -> dict:
+        command = request.get("command")
+        tag = {"customTag": request["customTag"]} if "customTag" in request else {}
+        try:
+            if command == "login":
+                arguments = request.get("arguments", {})
+                login = arguments.get("userId")
+                if (
+                    self._accounts is not None
+                    and self._accounts.get(login) != arguments.get("password")
+                ):
+                    raise EmulatorError("BE005")
+                session = _Session(login)
+                self._sessions[session.stream_session_id] = session
+                return {
+                    "status": True,
+                    "streamSessionId": session.stream_session_id,
+                    **tag,
+                }
+            if session is None:
+                raise EmulatorError("BE103")
+            if command == "logout":
+                return {"status": True, **tag}
+            handler = self._handlers.get(command)
+            if handler is None:
+                raise EmulatorError("BE104")
+            return {
+                "status": True,
+                "returnData": handler(request.get("arguments", {})),
+                **tag,
+            }
+        except EmulatorError as e:
+            error = {"errorCode": e.code, "errorDescr": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            error = {"errorCode": "BE110", "errorDescr": f"{CODES['BE110']}: {e}"}
+        return {"status": False, **error, **tag}
+
+    async def _serve_commands_(self, reader: StreamReader, writer: StreamWriter):
+        session = None
+        try:
+            async for request in read_requests(reader):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                response = self._reply_(request, session)
+                self.requests += 1
+                if response["status"] and "streamSessionId" in response:
+                    session = self._sessions[response["streamSessionId"]]
+                writer.write(encode_frame(response))
+                await writer.drain()
+        finally:
+            if session:
+                self._sessions.pop(session.stream_session_id, None)
+                for stream in session.streams:
+                    stream.close()
+                    stream.writer.close()
+
+    async def _serve_streaming_(self, reader: StreamReader, writer: StreamWriter):
+        stream = _Stream(writer)
+        session = None
+        try:
+            async for request in read_requests(reader):
+                session = self._sessions.get(request.get("streamSessionId"))
+                if session is None:
+                    break
+                session.streams.add(stream)
+                parsed = parse_stream_request(request)
+                if parsed is None:
+                    continue
+                subscribe, name, arguments = parsed
+                key = (name, arguments.get("symbol"))
+                if subscribe and key not in stream.tasks:
+                    stream.tasks[key] = asyncio.create_task(
+                        self._stream_(stream, name, arguments)
+                    )
+                elif not subscribe and key in stream.tasks:
+                    stream.tasks.pop(key).cancel()
+        finally:
+            stream.close()
+            if session:
+                session.streams.discard(stream)
+
+    async def _paced_(self, rate: float):
+        """
+        Yield the number of messages due at `rate` per second, at most every millisecond.
+        """
+        last = time.monotonic()
+        due = 0.0
+        while True:
+            await asyncio.sleep(max(1 / rate, 0.001) if rate > 0 else 3600)
+            now = time.monotonic()
+            due += (now - last) * rate
+            last = now
+            if due >= 1:
+                count = int(due)
+                due -= count
+                yield count
+
+    async def _stream_(self, stream: _Stream, name: str, arguments: dict):
+        symbol = arguments.get("symbol")
+        if name == "tickPrices":
+            if symbol not in self._symbols:
+                return
+            max_level = arguments.get("maxLevel") or 0
+            async for count in self._paced_(self.tick_rate):
+                for _ in range(count):
+                    self._step_(symbol)
+                    for level in range(max_level + 1):
+                        stream.send("tickPrices", self._tick_record_(symbol, level))
+                await stream.writer.drain()
+        elif name == "candles":
+            if symbol not in self._symbols:
+                return
+            async for _ in self._paced_(1 / self.candle_interval):
+                ctm = self._now_() // 60_000 * 60_000 - 60_000
+                bar = self._bar_(symbol, ctm)
+                digits = self._symbols[symbol][1]
+                scale = 10.0**-digits
+                open_ = bar["open"] * scale
+                stream.send(
+                    "candle",
+                    {
+                        "close": round(open_ + bar["close"] * scale, digits),
+                        "ctm": ctm,
+                        "ctmString": "",
+                        "high": round(open_ + bar["high"] * scale, digits),
+                        "low": round(open_ + bar["low"] * scale, digits),
+                        "open": round(open_, digits),
+                        "quoteId": 1,
+                        "symbol": symbol,
+                        "vol": bar["vol"],
+                    },
+                )
+                await stream.writer.drain()
+        elif name in ("trades", "profits", "balance"):
+            async for count in self._paced_(self.trade_rate):
+                for _ in range(count):
+                    stream.send(*self._account_message_(name))
+                await stream.writer.drain()
+        elif name == "keepAlive":
+            while True:
+                stream.send("keepAlive", {"timestamp": self._now_()})
+                await stream.writer.drain()
+                await asyncio.sleep(3)
+        else:
+            await asyncio.Event().wait()
+
+    def _account_message_(self, name: str) -> tuple[str, dict]:
+        if name == "balance":
+            margin = self._margin_level_()
+            return "balance", {
+                "balance": margin["balance"],
+                "credit": margin["credit"],
+                "equity": margin["equity"],
+                "margin": margin["margin"],
+                "marginFree": margin["margin_free"],
+                "marginLevel": margin["margin_level"],
+            }
+        symbol = self._random.choice(list(self._symbols))
+        order = self._random.choice(list(self._trades) or [next(self._orders)])
+        profit = round(self._random.gauss(0, 10), 2)
+        if name == "profits":
+            return "profit", {
+                "order": order,
+                "order2": order,
+                "position": order,
+                "profit": profit,
+            }
+        bid, ask = self._quote_(symbol)
+        return "trade", {
+            "close_price": bid,
+            "close_time": None,
+            "closed": False,
+            "cmd": 0,
+            "comment": "",
+            "commission": 0.0,
+            "customComment": None,
+            "digits": self._symbols[symbol][1],
+            "expiration": None,
+            "margin_rate": 0.0,
+            "offset": 0,
+            "open_price": ask,
+            "open_time": self._now_(),
+            "order": order,
+            "order2": order,
+            "position": order,
+            "profit": profit,
+            "sl": 0.0,
+            "state": "Modified",
+            "storage": 0.0,
+            "symbol": symbol,
+            "tp": 0.0,
+            "type": 0,
+            "volume": 0.01,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Api._DEMO.port)
+    parser.add_argument("--streaming-port", type=int, default=Api._DEMO.streaming)
+    parser.add_argument("--tls", action="store_true", help="use a self-signed certificate")
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    parser.add_argument("--candle-interval", type=float, default=60.0)
+    parser.add_argument("--trade-rate", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--symbol-count", type=int, default=0, help="synthetic symbols to add"
+    )
+    args = parser.parse_args()
+    symbols = DEFAULT_SYMBOLS | {
+        f"SYM{index:05d}": (100.0, 2) for index in range(args.symbol_count)
+    }
+    emulator = XapiEmulator(
+        host=args.host,
+        port=args.port,
+        streaming_port=args.streaming_port,
+        tls=args.tls,
+        symbols=symbols,
+        tick_rate=args.tick_rate,
+        candle_interval=args.candle_interval,
+        trade_rate=args.trade_rate,
+        latency=args.latency,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(emulator.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import abc
+import logging
+import os
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from ._codec import decoder
+
+Listener = Callable[[Any], None]
+
+
+def _call_listener_(listener: Listener, Type: type | None, data: dict):
+    """
+    Decode raw message data and call a listener, used in executor threads and processes.
+    """
+    try:
+        listener(decoder(Type)(data) if Type else data)
+    except Exception:
+        logging.exception(f"Listener {listener!r} failed")
+
+
+class ListenerExecutor(abc.ABC):
+    """
+    Runs subscription listeners away from the streaming reader.
+
+    Messages are submitted with a key, messages with the same key are passed to the
+    listener in the order they arrived. Raw message data is decoded by the executor,
+    so decoding does not run on the event loop either. Exceptions raised by listeners
+    are logged.
+
+    Unsubscribe the listeners before calling `shutdown`. Messages submitted after
+    `shutdown` are dropped and counted in `dropped`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._closed = False
+        self.dropped = 0
+        "Messages submitted after shutdown and not passed to their listener."
+
+    def _rejected_(self) -> bool:
+        """
+        Counts and logs a message submitted after shutdown.
+        """
+        if not self._closed:
+            return False
+        if not self.dropped:
+            logging.warning(
+                f"{type(self).__name__} is shut down, dropping listener calls, "
+                "unsubscribe before shutdown"
+            )
+        self.dropped += 1
+        return True
+
+    @abc.abstractmethod
+    def submit(self, key: Any, listener: Listener, Type: type | None, data: dict):
+        """
+        Schedule a listener call.
+
+        Args:
+            key (Any): Ordering key, e.g. the symbol of the message.
+            listener (Listener): Subscription listener.
+            Type (type | None): Record type the data is decoded to, None for raw data.
+            data (dict): Raw message data.
+        """
+
+    def _started_(self):
+        with self._lock:
+            self._depth += 1
+
+    def _finished_(self, *_):
+        with self._lock:
+            self._depth -= 1
+
+    @property
+    def depth(self) -> int:
+        """
+        Listener calls submitted and not finished yet.
+        """
+        return self._depth
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the executor.
+
+        Args:
+            wait (bool, optional): Wait for submitted calls to finish. Defaults to True.
+        """
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+
+class InlineExecutor(ListenerExecutor):
+    """
+    Calls listeners directly in the streaming reader, the default behaviour of `Api`.
+    """
+
+    def submit(self, key: Any, listener: Listener, Type: type | None, data: dict):
+        listener(decoder(Type)(data) if Type else data)
+
+
+class ThreadPoolListenerExecutor(ListenerExecutor):
+    """
+    Runs listeners on a shared thread pool.
+
+    Messages of different keys run in parallel, messages of one key run one at a time
+    in arrival order.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        """
+        Initialize ThreadPoolListenerExecutor object
+
+        Args:
+            max_workers (int | None, optional): Number of threads. Defaults to the `ThreadPoolExecutor` default.
+        """
+        super().__init__()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="pyxtb-listener")
+        self._queues: dict[Any, deque] = {}
+
+    def submit(self, key: Any, listener: Listener, Type: type | None, data: dict):
+        if self._rejected_():
+            return
+        with self._lock:
+            self._depth += 1
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append((listener, Type, data))
+                return
+            self._queues[key] = deque([(listener, Type, data)])
+        self._pool.submit(self._drain_, key)
+
+    def _drain_(self, key: Any):
+        queue = self._queues[key]
+        while True:
+            with self._lock:
+                if not queue:
+                    del self._queues[key]
+                    return
+                listener, Type, data = queue.popleft()
+            _call_listener_(listener, Type, data)
+            self._finished_()
+
+    def shutdown(self, wait: bool = True):
+        super().shutdown(wait)
+        self._pool.shutdown(wait)
+
+
+class WorkerExecutor(ThreadPoolListenerExecutor):
+    """
+    Runs listeners on a single dedicated thread, all messages in arrival order.
+    """
+
+    def __init__(self):
+        """
+        Initialize WorkerExecutor object
+        """
+        super().__init__(max_workers=1)
+
+    def submit(self, key: Any, listener: Listener, Type: type | None, data: dict):
+        super().submit(None, listener, Type, data)
+
+
+class ProcessPoolListenerExecutor(ListenerExecutor):
+    """
+    Runs listeners in worker processes.
+
+    Every key is assigned to one single-process pool, so messages of one key run in
+    arrival order. Listeners and record types have to be picklable, i.e. defined on the
+    module level. Only the raw message data is sent to the process, where it is decoded.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        """
+        Initialize ProcessPoolListenerExecutor object
+
+        Args:
+            max_workers (int | None, optional): Number of processes. Defaults to the CPU count.
+        """
+        super().__init__()
+        self._pools = [
+            ProcessPoolExecutor(max_workers=1)
+            for _ in range(max_workers or os.cpu_count() or 1)
+        ]
+
+    def submit(self, key: Any, listener: Listener, Type: type | None, data: dict):
+        if self._rejected_():
+            return
+        pool = self._pools[zlib.crc32(repr(key).encode()) % len(self._pools)]
+        self._started_()
+        future: Future = pool.submit(_call_listener_, listener, Type, data)
+        future.add_done_callback(self._finished_)
+
+    def shutdown(self, wait: bool = True):
+        super().shutdown(wait)
+        for pool in self._pools:
+            pool.shutdown(wait)
@@ -0,0 +1,377 @@
+"""
+Local gateway sharing the xAPI sessions of one account between many programs.
+
+The gateway logs in once and serves the xAPI command and streaming protocols on a
+pair of Unix sockets. Clients connect with `Api(address="unix:<path>")`:
+
+    XTB_PASSWORD=... python -m pyxtb.gateway 1000000 --path /tmp/xtb.sock --sessions 2
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+import os
+import time
+import uuid
+from asyncio import StreamReader, StreamWriter
+from typing import Callable
+
+from ._dispatch import MESSAGE_COMMANDS
+from ._protocol import (
+    encode_frame,
+    parse_stream_request,
+    read_requests,
+    track_connection,
+)
+from .accounts import SHARED_COMMANDS
+from .api import Api
+from .catalog import DEFAULT_TTL
+from .errors import CODES
+from .pool import ApiPool
+
+CACHEABLE_COMMANDS = {
+    **SHARED_COMMANDS,
+    "getAllSymbols": DEFAULT_TTL,
+    "getSymbol": DEFAULT_TTL,
+    "getVersion": 6 * 60 * 60,
+}
+"Commands answered from memory, with the TTL of their cached replies in seconds."
+
+DEFAULT_CLIENT_BUFFER = 4 * 1024 * 1024
+"Default bytes of streaming messages buffered for a client before it is disconnected."
+
+
+class _Client:
+    def __init__(self, login: int):
+        self.login = login
+        self.stream_session_id = uuid.uuid4().hex
+        self.streams: set["_ClientStream"] = set()
+
+
+class _ClientStream:
+    def __init__(self, writer: StreamWriter):
+        self.writer = writer
+        self.subscriptions: dict[tuple[str, str | None], Callable] = {}
+
+
+class Gateway:
+    """
+    Multiplexer of local client programs over the sessions of one `Api`.
+
+    Clients log in with the credentials of the gateway account. Their commands are
+    forwarded through the gateway `Api`, so all clients share its rate limiters and
+    priority lanes, or the sessions of an `ApiPool`. Replies of `CACHEABLE_COMMANDS` are
+    cached, concurrent identical requests wait for the same reply. `ping` is answered
+    locally. Streaming subscriptions of all clients are merged, the gateway subscribes
+    once per command and symbol and fans the messages out. A client reading its
+    streaming socket too slowly to keep its buffer under `max_client_buffer` is
+    disconnected instead of slowing down the others. Both sockets are only accessible
+    to the user running the gateway.
+
+    Examples:
+        >>> async with Api(1000000, "password") as api:
+        >>>     async with Gateway(api, "/tmp/xtb.sock") as gateway:
+        >>>         await gateway.serve_forever()
+        >>>
+        >>> async with Api(1000000, "password", address="unix:/tmp/xtb.sock") as api:
+        >>>     symbols = await api.get_all_symbols()
+    """
+
+    def __init__(
+        self,
+        api: Api,
+        path: str,
+        cacheable: dict[str, float] = CACHEABLE_COMMANDS,
+        max_client_buffer: int = DEFAULT_CLIENT_BUFFER,
+    ):
+        """
+        Initialize Gateway object
+
+        Args:
+            api (Api): Logged in connector holding the xAPI sessions.
+            path (str): Path of the command socket, the streaming socket gets the `.stream` suffix.
+            cacheable (dict[str, float], optional): Cached commands with their TTL in seconds. Defaults to `CACHEABLE_COMMANDS`.
+            max_client_buffer (int, optional): Bytes of streaming messages buffered for a client before it is disconnected. Defaults to 4 MiB.
+        """
+        self.api = api
+        self.path = path
+        self._cacheable = dict(cacheable)
+        self._max_client_buffer = max_client_buffer
+        self._cache: dict[tuple[str, str], tuple[float, dict]] = {}
+        self._fetching: dict[tuple[str, str], asyncio.Task] = {}
+        self._clients: dict[str, _Client] = {}
+        self._servers: list[asyncio.Server] = []
+        self._connections: set[asyncio.Task] = set()
+        self._last_message: tuple[dict | None, bytes] = (None, b"")
+        self.forwarded = 0
+        "Commands forwarded to xAPI."
+        self.cache_hits = 0
+        "Commands answered from the cache or by an identical request in flight."
+
+    async def start(self):
+        """
+        Start listening on the command and streaming sockets.
+        """
+        for handler, path in (
+            (self._serve_commands_, self.path),
+            (self._serve_streaming_, self.path + ".stream"),
+        ):
+            if os.path.exists(path):
+                os.unlink(path)
+            server = await asyncio.start_unix_server(track_connection(handler, self._connections), path)
+            os.chmod(path, 0o600)
+            self._servers.append(server)
+
+    async def close(self):
+        """
+        Stop the servers, close all client connections and remove the sockets.
+        """
+        for server in self._servers:
+            server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        for path in (self.path, self.path + ".stream"):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def serve_forever(self):
+        """
+        Start the gateway if needed and serve until cancelled.
+        """
+        if not self._servers:
+            await self.start()
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in self._servers))
+        finally:
+            await self.close()
+
+    @property
+    def clients(self) -> int:
+        """
+        Number of logged in clients.
+        """
+        return len(self._clients)
+
+    def _login_(self, request: dict) -> _Client | None:
+        arguments = request.get("arguments") or {}
+        if str(arguments.get("userId")) != str(self.api._login):
+            return None
+        if not hmac.compare_digest(
+            str(arguments.get("password", "")), str(self.api._password)
+        ):
+            return None
+        client = _Client(self.api._login)
+        self._clients[client.stream_session_id] = client
+        return client
+
+    async def _serve_commands_(self, reader: StreamReader, writer: StreamWriter):
+        client = None
+        tasks: set[asyncio.Task] = set()
+        try:
+            async for request in read_requests(reader):
+                command = request.get("command")
+                if client is None:
+                    if command == "login":
+                        client = self._login_(request)
+                    if client is None:
+                        code = "BE005" if command == "login" else "BE103"
+                        writer.write(encode_frame(_error_(code, request)))
+                        continue
+                    writer.write(
+                        encode_frame(
+                            {
+                                "status": True,
+                                "streamSessionId": client.stream_session_id,
+                            }
+                        )
+                    )
+                    continue
+                if command == "logout":
+                    writer.write(encode_frame(_reply_({"status": True}, request)))
+                    break
+                task = asyncio.create_task(self._answer_(writer, request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if client:
+                self._clients.pop(client.stream_session_id, None)
+                for stream in list(client.streams):
+                    stream.writer.close()
+
+    async def _answer_(self, writer: StreamWriter, request: dict):
+        command = request.get("command") or ""
+        kwargs = {
+            key: value
+            for key, value in request.items()
+            if key not in ("command", "customTag")
+        }
+        try:
+            if command == "ping":
+                response = {"status": True}
+            elif command in self._cacheable:
+                response = await self._cached_(command, kwargs)
+            else:
+                self.forwarded += 1
+                response = await self.api._request_(command, **kwargs)
+        except Exception as e:
+            logging.error(f"Gateway command {command} failed: {e!r}")
+            response = _error_("EX001", request)
+        writer.write(encode_frame(_reply_(response, request)))
+        await writer.drain()
+
+    async def _cached_(self, command: str, kwargs: dict) -> dict:
+        """
+        Reply of a cacheable command, fetched once per TTL for all clients.
+        """
+        key = (command, json.dumps(kwargs, sort_keys=True))
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] <= self._cacheable[command]:
+            self.cache_hits += 1
+            return entry[1]
+        task = self._fetching.get(key)
+        if task is None:
+            task = self._fetching[key] = asyncio.ensure_future(
+                self._fetch_(key, command, kwargs)
+            )
+            task.add_done_callback(lambda _: self._fetching.pop(key, None))
+        else:
+            self.cache_hits += 1
+        return await asyncio.shield(task)
+
+    async def _fetch_(self, key: tuple[str, str], command: str, kwargs: dict) -> dict:
+        self.forwarded += 1
+        response = await self.api._request_(command, **kwargs)
+        if response["status"]:
+            self._cache[key] = (time.monotonic(), response)
+        return response
+
+    def invalidate(self, command: str | None = None):
+        """
+        Drop cached replies so they are fetched again.
+
+        Args:
+            command (str | None, optional): Command to drop. Defaults to all commands.
+        """
+        for key in list(self._cache):
+            if command is None or key[0] == command:
+                del self._cache[key]
+
+    def _frame_(self, message_command: str, data: dict) -> bytes:
+        """
+        Encodes a streaming message once for all clients receiving it.
+        """
+        last_data, frame = self._last_message
+        if data is not last_data:
+            frame = encode_frame({"command": message_command, "data": data})
+            self._last_message = (data, frame)
+        return frame
+
+    async def _serve_streaming_(self, reader: StreamReader, writer: StreamWriter):
+        stream = _ClientStream(writer)
+        client = None
+        try:
+            async for request in read_requests(reader):
+                client = self._clients.get(request.get("streamSessionId"))
+                if client is None:
+                    break
+                client.streams.add(stream)
+                parsed = parse_stream_request(request)
+                if parsed is None:
+                    continue
+                subscribe, name, kwargs = parsed
+                key = (name, kwargs.get("symbol"))
+                if subscribe and key not in stream.subscriptions:
+                    stream.subscriptions[key] = await self.api._subscribe_(
+                        name, None, self._forwarder_(stream, name), **kwargs
+                    )
+                elif not subscribe and key in stream.subscriptions:
+                    await stream.subscriptions.pop(key)()
+        finally:
+            for unsubscribe in stream.subscriptions.values():
+                try:
+                    await unsubscribe()
+                except Exception as e:
+                    logging.debug(f"Gateway unsubscribe failed: {e!r}")
+            stream.subscriptions.clear()
+            if client:
+                client.streams.discard(stream)
+
+    def _forwarder_(self, stream: _ClientStream, name: str) -> Callable[[dict], None]:
+        message_command = MESSAGE_COMMANDS.get(name, name)
+        writer = stream.writer
+        limit = self._max_client_buffer
+
+        def forward(data: dict):
+            if writer.is_closing():
+                return
+            if writer.transport.get_write_buffer_size() > limit:
+                logging.warning("Gateway client reads too slowly, disconnecting")
+                writer.transport.abort()
+                return
+            writer.write(self._frame_(message_command, data))
+
+        return forward
+
+
+def _reply_(response: dict, request: dict) -> dict:
+    if "customTag" in request:
+        return {**response, "customTag": request["customTag"]}
+    return {key: value for key, value in response.items() if key != "customTag"}
+
+
+def _error_(code: str, request: dict) -> dict:
+    return _reply_(
+        {"status": False, "errorCode": code, "errorDescr": CODES.get(code, code)},
+        request,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("login", type=int)
+    parser.add_argument("--path", default="/tmp/pyxtb.sock")
+    parser.add_argument("--real", action="store_true", help="use the real account server")
+    parser.add_argument(
+        "--sessions", type=int, default=1, help="command sessions of the account"
+    )
+    parser.add_argument(
+        "--password-env",
+        default="XTB_PASSWORD",
+        help="environment variable holding the password",
+    )
+    args = parser.parse_args()
+    password = os.environ[args.password_env]
+
+    async def serve():
+        api = (
+            ApiPool(args.login, password, size=args.sessions, demo=not args.real)
+            if args.sessions > 1
+            else Api(args.login, password, demo=not args.real)
+        )
+        async with api:
+            await Gateway(api, args.path).serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ._codec import decode
+from ._types import ChartRangeInfoRecord, ChartResponseRecord, Period, Time
+from .api import Api
+from .chart import ChartFrame
+
+MAX_CANDLES = 50_000
+"Maximal number of candles returned by a single chart request, see error EX009."
+
+_DAY = 24 * 60 * 60 * 1000
+
+AVAILABILITY: dict[Period, Time | None] = {
+    Period.PERIOD_M1: 31 * _DAY,
+    Period.PERIOD_M5: 31 * _DAY,
+    Period.PERIOD_M15: 31 * _DAY,
+    Period.PERIOD_M30: 7 * 31 * _DAY,
+    Period.PERIOD_H1: 7 * 31 * _DAY,
+    Period.PERIOD_H4: 13 * 31 * _DAY,
+    Period.PERIOD_D1: None,
+    Period.PERIOD_W1: None,
+    Period.PERIOD_MN1: None,
+}
+"""
+How far back the server keeps bars of each period in milliseconds, None without a limit.
+
+M1, M5 and M15 bars are available for about 1 month, M30 and H1 for 7 months and H4
+for 13 months, see `Api.get_chart_last_request`. These are the guaranteed ranges,
+the server may keep bars longer.
+"""
+
+
+@dataclass(frozen=True)
+class HistoryWindow:
+    """
+    Time range of a single `getChartRangeRequest` call
+    """
+
+    symbol: str
+    period: Period
+    start: Time
+    end: Time
+
+    @property
+    def key(self) -> str:
+        """
+        Identifier of the window used in checkpoints.
+        """
+        return f"{self.symbol}|{int(self.period)}|{self.start}|{self.end}"
+
+    def to_info(self) -> ChartRangeInfoRecord:
+        """
+        Chart range request arguments for this window.
+        """
+        return ChartRangeInfoRecord(
+            period=self.period,
+            start=self.start,
+            symbol=self.symbol,
+            end=self.end,
+            ticks=0,
+            _other={},
+        )
+
+
+class HistoryDownloader:
+    """
+    Concurrent, resumable downloader of chart history.
+
+    Splits every (symbol, period) range into windows the server returns in one call and
+    downloads them concurrently. Requests are spaced by the rate limiter of the `Api`
+    (or spread over sessions of an `ApiPool`). Bars of overlapping windows are
+    deduplicated by `ctm`. With `checkpoint_dir` set, downloaded bars and finished
+    windows are persisted, so a restarted job fetches only the remaining windows.
+
+    Examples:
+        >>> async with ApiPool(1000000, "password", size=4) as pool:
+        >>>     downloader = HistoryDownloader(pool, checkpoint_dir="backfill")
+        >>>     history = await downloader.download(
+        >>>         ["EURUSD", "US500"], [Period.PERIOD_M1, Period.PERIOD_H1], start, end
+        >>>     )
+        >>>     eurusd_m1 = history["EURUSD", Period.PERIOD_M1]
+    """
+
+    def __init__(
+        self,
+        api: Api,
+        checkpoint_dir: str | os.PathLike | None = None,
+        concurrency: int = 4,
+        max_candles: int = MAX_CANDLES,
+        availability: dict[Period, Time | None] = AVAILABILITY,
+    ):
+        """
+        Initialize HistoryDownloader object
+
+        Args:
+            api (Api): Logged in API connector.
+            checkpoint_dir (str | os.PathLike | None, optional): Directory for progress and downloaded bars. Defaults to None.
+            concurrency (int, optional): Maximal number of windows requested at once. Defaults to 4.
+            max_candles (int, optional): Maximal number of candles in one window. Defaults to 50 000.
+            availability (dict[Period, Time | None], optional): How far back bars of each period are requested in milliseconds. Defaults to `AVAILABILITY`.
+        """
+        self._api = api
+        self._checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self._concurrency = concurrency
+        self._max_candles = max_candles
+        self._availability = dict(availability)
+        self._done: set[str] = set()
+        self._digits: dict[tuple[str, Period], int] = {}
+        self._bars: dict[tuple[str, Period], dict[Time, dict]] = {}
+        if self._checkpoint_dir:
+            self._checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            self._load_checkpoint_()
+
+    def windows(
+        self, symbols: list[str], periods: list[Period], start: Time, end: Time
+    ) -> list[HistoryWindow]:
+        """
+        Split the requested ranges into server sized windows.
+
+        Windows ending before the range the server keeps for their period, see
+        `AVAILABILITY`, are left out, they could only return no bars.
+
+        Args:
+            symbols (list[str]): Symbols to download.
+            periods (list[Period]): Periods to download.
+            start (Time): Start of the range.
+            end (Time): End of the range.
+
+        Returns:
+            list[HistoryWindow]: Windows covering every (symbol, period) range.
+        """
+        now = int(time.time() * 1000)
+        windows = []
+        for symbol in symbols:
+            for period in periods:
+                span = self._max_candles * int(period) * 60_000
+                available = self._availability.get(Period(period))
+                earliest = now - available if available else None
+                window_start = start
+                while window_start < end:
+                    window_end = min(window_start + span, end)
+                    if earliest is None or window_end > earliest:
+                        windows.append(
+                            HistoryWindow(
+                                symbol, Period(period), window_start, window_end
+                            )
+                        )
+                    window_start = window_end
+        return windows
+
+    def _series_path_(self, symbol: str, period: Period) -> Path:
+        name = symbol.replace(os.sep, "_")
+        return self._checkpoint_dir / f"{name}_{int(period)}.jsonl"
+
+    def _progress_path_(self) -> Path:
+        return self._checkpoint_dir / "progress.json"
+
+    def _load_checkpoint_(self):
+        if not self._progress_path_().exists():
+            return
+        progress = json.loads(self._progress_path_().read_text())
+        self._done = set(progress["done"])
+        for series, digits in progress["digits"].items():
+            symbol, period = series.rsplit("|", 1)
+            key = (symbol, Period(int(period)))
+            self._digits[key] = digits
+            bars = self._bars.setdefault(key, {})
+            path = self._series_path_(*key)
+            if path.exists():
+                with path.open() as file:
+                    for line in file:
+                        rate = json.loads(line)
+                        bars[rate["ctm"]] = rate
+
+    def _save_window_(self, window: HistoryWindow, rates: list[dict]):
+        with self._series_path_(window.symbol, window.period).open("a") as file:
+            file.writelines(json.dumps(rate) + "\n" for rate in rates)
+        progress = {
+            "done": sorted(self._done),
+            "digits": {
+                f"{symbol}|{int(period)}": digits
+                for (symbol, period), digits in self._digits.items()
+            },
+        }
+        tmp_path = self._progress_path_().with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(progress))
+        os.replace(tmp_path, self._progress_path_())
+
+    async def _download_window_(
+        self, window: HistoryWindow, semaphore: asyncio.Semaphore
+    ):
+        async with semaphore:
+            data = await self._api.get_chart_range_request(
+                window.to_info(), as_json=True
+            )
+        key = (window.symbol, window.period)
+        rates = data["rateInfos"]
+        self._digits[key] = data["digits"]
+        bars = self._bars.setdefault(key, {})
+        for rate in rates:
+            bars[rate["ctm"]] = rate
+        self._done.add(window.key)
+        if self._checkpoint_dir:
+            self._save_window_(window, rates)
+
+    async def download(
+        self,
+        symbols: list[str],
+        periods: list[Period],
+        start: Time,
+        end: Time,
+        as_arrays: bool = False,
+    ) -> dict[tuple[str, Period], ChartResponseRecord | ChartFrame]:
+        """
+        Download chart history of all symbols and periods in the given range.
+
+        Windows finished in a previous run with the same checkpoint directory are skipped.
+        If some windows fail, all other windows are still downloaded and checkpointed
+        before the first error is raised.
+
+        Args:
+            symbols (list[str]): Symbols to download.
+            periods (list[Period]): Periods to download.
+            start (Time): Start of the range.
+            end (Time): End of the range.
+            as_arrays (bool, optional): If True, returns `ChartFrame` objects. Defaults to False.
+
+        Returns:
+            dict[tuple[str, Period], ChartResponseRecord | ChartFrame]: History keyed by (symbol, period),
+                sorted by `ctm` without duplicates.
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+        pending = [
+            window
+            for window in self.windows(symbols, periods, start, end)
+            if window.key not in self._done
+        ]
+        results = await asyncio.gather(
+            *(self._download_window_(window, semaphore) for window in pending),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logging.error(f"{len(errors)} of {len(pending)} history windows failed")
+            raise errors[0]
+
+        history = {}
+        for symbol in symbols:
+            for period in periods:
+                key = (symbol, Period(period))
+                bars = self._bars.get(key, {})
+                data = {
+                    "digits": self._digits.get(key, 0),
+                    "rateInfos": [
+                        bars[ctm] for ctm in sorted(bars) if start <= ctm <= end
+                    ],
+                }
+                history[key] = (
+                    ChartFrame.from_json(data)
+                    if as_arrays
+                    else decode(ChartResponseRecord, data)
+                )
+        return history
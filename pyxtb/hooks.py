@@ -0,0 +1,105 @@
+import enum
+import logging
+import time
+from typing import Callable
+
+Hook = Callable[[str | None, float, int], None]
+"Hook called with the command name, a `time.perf_counter` timestamp and a size."
+
+
+class HookPoint(enum.Enum):
+    """
+    Points of the request and streaming paths of `Api` hooks can be attached to
+    """
+
+    BEFORE_SERIALIZE = "before_serialize"
+    "Command about to be encoded to JSON, size is 0"
+    AFTER_WRITE = "after_write"
+    "Command written to its connection, size in bytes"
+    FRAME_RECEIVED = "frame_received"
+    "Frame read from a connection before parsing, the command is None, size in bytes"
+    AFTER_PARSE = "after_parse"
+    "Frame parsed from JSON, size of the frame in bytes"
+    AFTER_DECODE = "after_decode"
+    "Reply or streaming message decoded to record types, size in records"
+    BEFORE_CALLBACK = "before_callback"
+    "Subscription listener about to be called, size is 0"
+    AFTER_CALLBACK = "after_callback"
+    "Subscription listener returned, size is 0"
+
+
+class Hooks:
+    """
+    Registry of profiling and tracing hooks of `Api`.
+
+    Every hook point is a list of hooks, so an unused point costs a single truthiness
+    check on the hot path. Hooks run synchronously on the event loop in the order
+    they were added, exceptions raised by hooks are logged. Streaming messages pass the
+    points in order, so consecutive timestamps of one message break down where its
+    time goes. Listeners run by a `ListenerExecutor` skip the decode and callback points.
+
+    Examples:
+        >>> hooks = Hooks()
+        >>> hooks.add(HookPoint.AFTER_PARSE, lambda command, timestamp, size: ...)
+        >>> async with Api(1000000, "password", hooks=hooks) as api:
+        >>>     ...
+    """
+
+    def __init__(self):
+        """
+        Initialize Hooks object
+        """
+        self.before_serialize: list[Hook] = []
+        self.after_write: list[Hook] = []
+        self.frame_received: list[Hook] = []
+        self.after_parse: list[Hook] = []
+        self.after_decode: list[Hook] = []
+        self.before_callback: list[Hook] = []
+        self.after_callback: list[Hook] = []
+        self.active = False
+        "Whether any hook is registered."
+
+    def add(self, point: HookPoint, hook: Hook) -> Callable[[], None]:
+        """
+        Attach a hook to a point.
+
+        Args:
+            point (HookPoint): Hook point.
+            hook (Hook): Function called with the command name, timestamp and size.
+
+        Returns:
+            Callable[[], None]: Function removing the hook.
+        """
+        getattr(self, HookPoint(point).value).append(hook)
+        self.active = True
+        return lambda: self.remove(point, hook)
+
+    def remove(self, point: HookPoint, hook: Hook):
+        """
+        Detach a hook from a point, does nothing if it is not attached.
+
+        Args:
+            point (HookPoint): Hook point.
+            hook (Hook): Hook added before.
+        """
+        hooks = getattr(self, HookPoint(point).value)
+        if hook in hooks:
+            hooks.remove(hook)
+        self.active = any(getattr(self, point.value) for point in HookPoint)
+
+    def clear(self):
+        """
+        Detach all hooks.
+        """
+        for point in HookPoint:
+            getattr(self, point.value).clear()
+        self.active = False
+
+    @staticmethod
+    def _emit_(hooks: list[Hook], command: str | None, size: int = 0):
+        timestamp = time.perf_counter()
+        for hook in hooks:
+            try:
+                hook(command, timestamp, size)
+            except Exception:
+                logging.exception(f"Hook {hook!r} failed")
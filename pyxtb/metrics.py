@@ -0,0 +1,361 @@
+import asyncio
+import bisect
+import time
+from typing import Iterable
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"Upper bounds of histogram buckets in seconds."
+
+DEFAULT_METRICS_PORT = 9464
+"Port of the Prometheus text exporter."
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds, the Prometheus histogram model.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize Histogram object
+
+        Args:
+            bounds (Iterable[float], optional): Sorted upper bounds of the buckets. Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        Add a sample.
+
+        Args:
+            value (float): Sample value.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, quantile: float) -> float:
+        """
+        Upper bound of the bucket containing a quantile.
+
+        Args:
+            quantile (float): Quantile between 0 and 1.
+
+        Returns:
+            float: Bucket bound, infinity for samples above the last bound and 0 without samples.
+        """
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        """
+        Count, sum, mean and approximate p50/p99 of the samples.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+    def _prometheus_(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class _StreamCounter:
+    __slots__ = ("messages", "second", "window", "rate", "lag")
+
+    def __init__(self):
+        self.messages = 0
+        self.second = 0
+        self.window = 0
+        self.rate = 0
+        self.lag = Histogram()
+
+
+def _escape_(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """
+    Registry of latency and throughput metrics of `Api` connections.
+
+    Pass one registry to any number of `Api` instances, they record into it from their
+    command and streaming paths. Recording is skipped entirely without a registry.
+    Times are in seconds.
+
+    Examples:
+        >>> metrics = Metrics()
+        >>> server = await metrics.serve(port=9464)
+        >>> async with Api(1000000, "password", metrics=metrics) as api:
+        >>>     await api.get_trades_history(0, 0)
+        >>>     print(metrics.snapshot()["commands"]["getTradesHistory"])
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize Metrics object
+
+        Args:
+            buckets (Iterable[float], optional): Upper bounds of histogram buckets in seconds. Defaults to `DEFAULT_BUCKETS`.
+        """
+        self._buckets = tuple(buckets)
+        self._started = time.time()
+        self.commands: dict[str, Histogram] = {}
+        "Round trip times by command"
+        self.decoding: dict[str, Histogram] = {}
+        "Decoding times of replies by command"
+        self.errors: dict[str, int] = {}
+        "Error replies by error code, see `errors.CODES`"
+        self.bytes: dict[tuple[str, str], int] = {}
+        "Bytes by connection (command or streaming) and direction (in or out)"
+        self.streams: dict[str, _StreamCounter] = {}
+
+    def _histogram_(self, histograms: dict[str, Histogram], key: str) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self._buckets)
+        return histogram
+
+    def observe_command(self, command: str, seconds: float):
+        """
+        Record the round trip of a command.
+
+        Args:
+            command (str): Command name.
+            seconds (float): Time from sending the command to receiving its reply.
+        """
+        self._histogram_(self.commands, command).observe(seconds)
+
+    def observe_decode(self, command: str, seconds: float):
+        """
+        Record decoding of a command reply to record types.
+
+        Args:
+            command (str): Command name.
+            seconds (float): Decoding time.
+        """
+        self._histogram_(self.decoding, command).observe(seconds)
+
+    def count_error(self, code: str | None):
+        """
+        Record an error reply.
+
+        Args:
+            code (str | None): `errorCode` of the reply.
+        """
+        code = code or "unknown"
+        self.errors[code] = self.errors.get(code, 0) + 1
+
+    def add_bytes(self, connection: str, direction: str, size: int):
+        """
+        Record bytes sent or received.
+
+        Args:
+            connection (str): "command" or "streaming".
+            direction (str): "in" or "out".
+            size (int): Number of bytes.
+        """
+        key = (connection, direction)
+        self.bytes[key] = self.bytes.get(key, 0) + size
+
+    def observe_stream(self, command: str, data: dict):
+        """
+        Record a streaming message.
+
+        Messages with a `timestamp` field, e.g. ticks, also record their lag, the time
+        from the server timestamp to arrival.
+
+        Args:
+            command (str): Streaming message command, e.g. "tickPrices".
+            data (dict): Raw message data.
+        """
+        counter = self.streams.get(command)
+        if counter is None:
+            counter = self.streams[command] = _StreamCounter()
+        now = time.time()
+        second = int(now)
+        if second != counter.second:
+            counter.rate = counter.window if second == counter.second + 1 else 0
+            counter.second = second
+            counter.window = 0
+        counter.window += 1
+        counter.messages += 1
+        timestamp = data.get("timestamp")
+        if timestamp:
+            counter.lag.observe(now - timestamp / 1000)
+
+    def snapshot(self) -> dict:
+        """
+        Current values of all metrics.
+
+        Returns:
+            dict: Histogram summaries by command, error counts, byte counts and stream
+                message counts, rates over the last full second and lag.
+        """
+        second = int(time.time())
+        return {
+            "uptime": time.time() - self._started,
+            "commands": {
+                command: histogram.snapshot()
+                for command, histogram in self.commands.items()
+            },
+            "decoding": {
+                command: histogram.snapshot()
+                for command, histogram in self.decoding.items()
+            },
+            "errors": dict(self.errors),
+            "bytes": {
+                f"{connection}_{direction}": size
+                for (connection, direction), size in self.bytes.items()
+            },
+            "streams": {
+                command: {
+                    "messages": counter.messages,
+                    "rate": counter.rate
+                    if second == counter.second
+                    else counter.window
+                    if second == counter.second + 1
+                    else 0,
+                    "lag": counter.lag.snapshot(),
+                }
+                for command, counter in self.streams.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics prefixed with `pyxtb_`.
+        """
+        lines = []
+
+        def histograms(name: str, help: str, label: str, items: dict):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in items.items():
+                lines.extend(histogram._prometheus_(name, f'{label}="{_escape_(key)}"'))
+
+        histograms(
+            "pyxtb_command_duration_seconds",
+            "Command round trip time.",
+            "command",
+            self.commands,
+        )
+        histograms(
+            "pyxtb_decode_duration_seconds",
+            "Decoding time of command replies.",
+            "command",
+            self.decoding,
+        )
+        histograms(
+            "pyxtb_stream_lag_seconds",
+            "Time from the server timestamp of a streaming message to its arrival.",
+            "command",
+            {command: counter.lag for command, counter in self.streams.items()},
+        )
+
+        lines.append("# HELP pyxtb_errors_total Error replies by error code.")
+        lines.append("# TYPE pyxtb_errors_total counter")
+        for code, count in self.errors.items():
+            lines.append(f'pyxtb_errors_total{{code="{_escape_(code)}"}} {count}')
+
+        lines.append("# HELP pyxtb_bytes_total Bytes sent and received.")
+        lines.append("# TYPE pyxtb_bytes_total counter")
+        for (connection, direction), size in self.bytes.items():
+            lines.append(
+                f'pyxtb_bytes_total{{connection="{connection}",direction="{direction}"}} {size}'
+            )
+
+        snapshot = self.snapshot()["streams"]
+        lines.append("# HELP pyxtb_stream_messages_total Streaming messages received.")
+        lines.append("# TYPE pyxtb_stream_messages_total counter")
+        for command, stream in snapshot.items():
+            lines.append(
+                f'pyxtb_stream_messages_total{{command="{_escape_(command)}"}} {stream["messages"]}'
+            )
+        lines.append(
+            "# HELP pyxtb_stream_rate Streaming messages received in the last second."
+        )
+        lines.append("# TYPE pyxtb_stream_rate gauge")
+        for command, stream in snapshot.items():
+            lines.append(
+                f'pyxtb_stream_rate{{command="{_escape_(command)}"}} {stream["rate"]}'
+            )
+        return "\n".join(lines) + "\n"
+
+    async def _handle_scrape_(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = self.to_prometheus().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_METRICS_PORT
+    ) -> asyncio.Server:
+        """
+        Serve `to_prometheus` over HTTP to Prometheus scrapers.
+
+        Every request is answered with the metrics regardless of its path.
+
+        Args:
+            host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on. Defaults to 9464.
+
+        Returns:
+            asyncio.Server: Started server, close it to stop serving.
+        """
+        return await asyncio.start_server(self._handle_scrape_, host, port)
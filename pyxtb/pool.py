@@ -0,0 +1,202 @@
+import asyncio
+import logging
+
+from .api import DEFAULT_XAPI_ADDRESS, Api
+
+
+class ApiPool(Api):
+    """
+    Pool of authenticated XTB API command sessions.
+
+    Logs the same account into several command connections and sends every command
+    to the session with the fewest requests in flight. Streaming subscriptions use the
+    primary session. The pool exposes the same methods as `Api`.
+
+    Examples:
+        >>> async with ApiPool(1000000, "password", size=4) as pool:
+        >>>     charts = await asyncio.gather(
+        >>>         *(pool.get_chart_range_request(info) for info in infos)
+        >>>     )
+    """
+
+    _sessions: list[Api]
+
+    def __init__(
+        self,
+        login: int,
+        password: str,
+        size: int = 4,
+        app_name="pyxtb",
+        address=DEFAULT_XAPI_ADDRESS,
+        demo: bool = True,
+        **kwargs,
+    ):
+        """
+        Initialize ApiPool object
+
+        Args:
+            size (int, optional): Number of command sessions, including the primary one. Defaults to 4.
+            **kwargs: Additional keyword arguments passed to every `Api` session.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        super().__init__(
+            login, password, app_name=app_name, address=address, demo=demo, **kwargs
+        )
+        self._size = size
+        self._session_kwargs = dict(
+            app_name=app_name, address=address, demo=demo, **kwargs
+        )
+        self._session_kwargs.pop("reconnect", None)
+        self._sessions = []
+        self._restoring: dict[int, asyncio.Task] = {}
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+        Asynchronous context manager exit.
+
+        Closes additional sessions, then logs out the primary session.
+        """
+        for task in self._restoring.values():
+            task.cancel()
+        await asyncio.gather(
+            *(
+                session.__aexit__(exc_type, exc, tb)
+                for session in self._sessions
+                if session is not self
+            ),
+            return_exceptions=True,
+        )
+        return await super().__aexit__(exc_type, exc, tb)
+
+    def _new_session_(self) -> Api:
+        """
+        Creates an additional command session for the pooled account.
+
+        Returns:
+            Api: Not yet connected session.
+        """
+        return Api(self._login, self._password, **self._session_kwargs)
+
+    async def _open_session_(self) -> Api:
+        """
+        Creates and authenticates an additional command session.
+
+        Returns:
+            Api: Logged in session without a streaming connection.
+        """
+        session = self._new_session_()
+        await session._login_command_()
+        session._logged_in = True
+        session._connected.set()
+        session._start_heartbeat_()
+        return session
+
+    async def _restore_session_(self, index: int):
+        """
+        Replaces a dead additional session with a new one.
+
+        Args:
+            index (int): Index of the session in the pool.
+        """
+        try:
+            dead = self._sessions[index]
+            dead._logged_in = False
+            await dead.__aexit__(None, None, None)
+            self._sessions[index] = await self._open_session_()
+        except Exception as e:
+            logging.error(f"Restoring pool session {index} failed: {e}")
+        finally:
+            self._restoring.pop(index, None)
+
+    def _live_sessions_(self) -> list[Api]:
+        """
+        Returns sessions able to send commands and schedules restoring the dead ones.
+
+        A session whose connection is being restored is not live until it has logged in
+        again.
+
+        Returns:
+            list[Api]: Live sessions.
+        """
+        live = []
+        for index, session in enumerate(self._sessions):
+            task = session._command_reading_task
+            if task and not task.done():
+                if session._connected.is_set():
+                    live.append(session)
+            elif session is not self and index not in self._restoring:
+                self._restoring[index] = asyncio.Task(self._restore_session_(index))
+        return live
+
+    async def _wait_live_sessions_(self) -> list[Api]:
+        """
+        Waits until a session is live again while sessions are being restored.
+
+        Returns:
+            list[Api]: Live sessions, empty if every restore running at the call failed.
+        """
+        sessions = self._live_sessions_()
+        waiting = set(self._restoring.values())
+        if self._reconnect_task and not self._reconnect_task.done():
+            waiting.add(self._reconnect_task)
+        while not sessions and waiting:
+            _, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            sessions = self._live_sessions_()
+        return sessions
+
+    async def login(self):
+        """
+        Authenticate the primary session and all additional command sessions.
+
+        Raises:
+            Exception: If authentication of any session fails.
+        """
+        await super().login()
+        sessions = await asyncio.gather(
+            *(self._open_session_() for _ in range(self._size - 1))
+        )
+        self._sessions = [self, *sessions]
+
+    async def logout(self):
+        """
+        Terminate all sessions of the pool.
+        """
+        await asyncio.gather(
+            *(
+                session.logout()
+                for session in self._sessions
+                if session is not self and session._logged_in
+            )
+        )
+        await super().logout()
+
+    async def _request_(self, cmd: str, **kwargs):
+        """
+        Send a command through the least loaded session and wait for its raw response.
+
+        Sessions being restored are skipped. If none is live, the command waits for a
+        session to be restored.
+
+        Args:
+            cmd (str): The command to send.
+            **kwargs: Additional keyword arguments for the command.
+
+        Returns:
+            RESPONSE: Response of the server, including error responses.
+
+        Raises:
+            ConnectionError: If no session is connected or being restored.
+        """
+        sessions = await self._wait_live_sessions_()
+        if not sessions:
+            raise ConnectionError("No live sessions in pool")
+        session = min(sessions, key=lambda session: len(session._pending))
+        return await Api._request_(session, cmd, **kwargs)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of command sessions in the pool.
+        """
+        return self._size
@@ -0,0 +1,190 @@
+import math
+from array import array
+from dataclasses import dataclass
+
+_FIELDS = ("bid", "ask", "bidVolume", "askVolume", "timestamp", "sequence")
+_STRIDE = len(_FIELDS)
+
+
+@dataclass(frozen=True)
+class Quote:
+    """
+    Price level of a symbol in the quote book
+    """
+
+    symbol: str
+    level: int
+    "Price level, 0 is the best bid/ask"
+    bid: float
+    ask: float
+    bidVolume: float | None
+    askVolume: float | None
+    timestamp: int
+    "Time of the tick in milliseconds"
+    sequence: int
+    "Quote book sequence number of the last change of this level"
+
+
+@dataclass(frozen=True)
+class QuoteSnapshot:
+    """
+    Consistent view of several symbols at one quote book sequence number
+    """
+
+    sequence: int
+    quotes: dict[str, Quote]
+
+
+class QuoteBook:
+    """
+    Latest quotes of all symbols with their depth ladders.
+
+    Every symbol has one flat array of doubles holding all price levels received from
+    `tickPrices`, so reading the best bid/ask is O(1) and does not allocate per update.
+    Each update increments the book `sequence` and stamps the changed level with it.
+    `Api` feeds its `quote_book` from every streamed tick, so strategies can share it
+    instead of keeping their own copies, and removes a symbol when its last
+    `tickPrices` listener unsubscribes.
+    """
+
+    def __init__(self):
+        self._books: dict[str, array] = {}
+        self.sequence = 0
+
+    def update(self, tick: dict):
+        """
+        Apply a raw `STREAMING_TICK_RECORD`.
+
+        Args:
+            tick (dict): Raw tick data.
+        """
+        symbol = tick["symbol"]
+        level = tick.get("level") or 0
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = array("d")
+        offset = level * _STRIDE
+        if len(book) <= offset:
+            book.extend([math.nan] * (offset + _STRIDE - len(book)))
+        self.sequence += 1
+        bid_volume, ask_volume = tick.get("bidVolume"), tick.get("askVolume")
+        book[offset] = tick["bid"]
+        book[offset + 1] = tick["ask"]
+        book[offset + 2] = math.nan if bid_volume is None else bid_volume
+        book[offset + 3] = math.nan if ask_volume is None else ask_volume
+        book[offset + 4] = tick["timestamp"]
+        book[offset + 5] = self.sequence
+
+    def remove(self, symbol: str):
+        """
+        Drop all price levels of a symbol.
+
+        Args:
+            symbol (str): Symbol name.
+        """
+        self._books.pop(symbol, None)
+
+    def _quote_(self, symbol: str, book: array, level: int) -> Quote | None:
+        offset = level * _STRIDE
+        bid, ask, bid_volume, ask_volume, timestamp, sequence = book[
+            offset : offset + _STRIDE
+        ]
+        if math.isnan(sequence):
+            return None
+        return Quote(
+            symbol=symbol,
+            level=level,
+            bid=bid,
+            ask=ask,
+            bidVolume=None if math.isnan(bid_volume) else bid_volume,
+            askVolume=None if math.isnan(ask_volume) else ask_volume,
+            timestamp=int(timestamp),
+            sequence=int(sequence),
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._books
+
+    @property
+    def symbols(self) -> list[str]:
+        """
+        Symbols with at least one quote.
+        """
+        return list(self._books)
+
+    def best(self, symbol: str) -> Quote | None:
+        """
+        Best bid/ask of a symbol.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            Quote | None: Level 0 quote or None if not received yet.
+        """
+        book = self._books.get(symbol)
+        return self._quote_(symbol, book, 0) if book else None
+
+    def bid_ask(self, symbol: str) -> tuple[float, float]:
+        """
+        Best bid and ask prices of a symbol without creating a `Quote`.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            tuple[float, float]: Bid and ask, NaN if not received yet.
+        """
+        book = self._books.get(symbol)
+        return (book[0], book[1]) if book else (math.nan, math.nan)
+
+    def ladder(self, symbol: str) -> list[Quote]:
+        """
+        All received price levels of a symbol.
+
+        Args:
+            symbol (str): Symbol name.
+
+        Returns:
+            list[Quote]: Quotes ordered by level.
+        """
+        book = self._books.get(symbol)
+        if not book:
+            return []
+        quotes = (
+            self._quote_(symbol, book, level) for level in range(len(book) // _STRIDE)
+        )
+        return [quote for quote in quotes if quote]
+
+    def snapshot(self, symbols: list[str] | None = None) -> QuoteSnapshot:
+        """
+        Best quotes of many symbols taken at a single sequence number.
+
+        Args:
+            symbols (list[str] | None, optional): Symbols to include. Defaults to all symbols.
+
+        Returns:
+            QuoteSnapshot: Snapshot of best quotes.
+        """
+        quotes = {}
+        for symbol in self._books if symbols is None else symbols:
+            quote = self.best(symbol)
+            if quote:
+                quotes[symbol] = quote
+        return QuoteSnapshot(sequence=self.sequence, quotes=quotes)
+
+    def changed_since(self, sequence: int) -> list[str]:
+        """
+        Symbols with any level changed after the given sequence number.
+
+        Args:
+            sequence (int): Sequence number of a previous snapshot.
+
+        Returns:
+            list[str]: Changed symbols.
+        """
+        return [
+            symbol
+            for symbol, book in self._books.items()
+            if any(changed > sequence for changed in book[5::_STRIDE])
+        ]
@@ -0,0 +1,155 @@
+import asyncio
+import enum
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+
+DEFAULT_REQUEST_INTERVAL = 0.2
+"Minimal spacing between requests on one connection required by xAPI, in seconds."
+
+DEFAULT_REQUEST_BURST = 5
+"xAPI drops the connection after the spacing rule is broken 6 times in a row."
+
+
+class Priority(enum.IntEnum):
+    """
+    Priority lane of a request waiting for the rate limiter
+    """
+
+    HIGH = 0
+    "Trading requests, always sent first"
+    NORMAL = 1
+    ""
+    LOW = 2
+    "Bulk market data requests"
+
+
+COMMAND_PRIORITIES = {
+    "tradeTransaction": Priority.HIGH,
+    "tradeTransactionStatus": Priority.HIGH,
+    "getAllSymbols": Priority.LOW,
+    "getCalendar": Priority.LOW,
+    "getChartLastRequest": Priority.LOW,
+    "getChartRangeRequest": Priority.LOW,
+    "getNews": Priority.LOW,
+    "getSymbol": Priority.LOW,
+    "getTickPrices": Priority.LOW,
+    "getTradingHours": Priority.LOW,
+}
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Snapshot of rate limiter counters
+    """
+
+    queue_depth: int
+    "Requests currently waiting for a token"
+    requests: int
+    "Requests let through since creation"
+    delayed: int
+    "Requests which had to wait for a token"
+    total_wait: float
+    "Sum of waiting times in seconds"
+    max_wait: float
+    "Longest waiting time in seconds"
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate on a single connection.
+
+    Tokens are refilled every `interval` seconds up to `burst` tokens. Requests that find
+    the bucket empty wait in priority lanes, so trading requests overtake queued bulk requests.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_REQUEST_INTERVAL,
+        burst: int = DEFAULT_REQUEST_BURST,
+    ):
+        """
+        Initialize RateLimiter object
+
+        Args:
+            interval (float, optional): Seconds needed to refill one token. 0 disables limiting. Defaults to 0.2.
+            burst (int, optional): Bucket capacity. Defaults to 5.
+        """
+        self._interval = interval
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._requests = 0
+        self._delayed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _refill_(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) / self._interval
+        )
+        self._updated = now
+
+    def _schedule_(self):
+        if self._timer or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) * self._interval)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wake_)
+
+    def _wake_(self):
+        self._timer = None
+        self._refill_()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule_()
+
+    async def acquire(self, priority: Priority = Priority.NORMAL):
+        """
+        Wait until a request may be sent.
+
+        Args:
+            priority (Priority, optional): Lane of the request. Defaults to Priority.NORMAL.
+        """
+        self._requests += 1
+        if self._interval <= 0:
+            return
+
+        self._refill_()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._schedule_()
+        start = time.monotonic()
+        try:
+            await future
+        finally:
+            waited = time.monotonic() - start
+            self._delayed += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """
+        Current counters of the rate limiter.
+        """
+        return RateLimiterStats(
+            queue_depth=sum(1 for _, _, future in self._waiters if not future.done()),
+            requests=self._requests,
+            delayed=self._delayed,
+            total_wait=self._total_wait,
+            max_wait=self._max_wait,
+        )
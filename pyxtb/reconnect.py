@@ -0,0 +1,51 @@
+import random
+from dataclasses import dataclass
+
+REPLAYABLE_COMMANDS = frozenset({"ping", "tradeTransactionStatus"})
+"Commands without side effects besides the `get*` commands, safe to send again."
+
+
+def is_replayable(command: str) -> bool:
+    """
+    Whether a command may be sent again after its reply was lost.
+
+    Args:
+        command (str): Command name.
+
+    Returns:
+        bool: True for read-only commands, False e.g. for `tradeTransaction`.
+    """
+    return command.startswith("get") or command in REPLAYABLE_COMMANDS
+
+
+@dataclass
+class ReconnectPolicy:
+    """
+    Backoff of automatic reconnects of `Api`
+    """
+
+    initial_delay: float = 0.5
+    "Seconds before the first attempt"
+    max_delay: float = 30.0
+    "Upper bound of the delay between attempts in seconds"
+    multiplier: float = 2.0
+    "Growth of the delay after every failed attempt"
+    jitter: float = 0.5
+    "Fraction of the delay which is randomised, spreading reconnects of many clients"
+    max_attempts: int | None = None
+    "Attempts before giving up, None retries forever"
+
+    def delay(self, attempt: int) -> float:
+        """
+        Seconds to wait before an attempt.
+
+        Args:
+            attempt (int): Attempt number starting at 1.
+
+        Returns:
+            float: Jittered delay.
+        """
+        delay = min(
+            self.initial_delay * self.multiplier ** (attempt - 1), self.max_delay
+        )
+        return delay * (1 - self.jitter * random.random())
@@ -0,0 +1,385 @@
+import asyncio
+import bisect
+import enum
+import heapq
+import itertools
+import json
+import operator
+import os
+import struct
+import typing
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ._types import StreamingCandleRecord, StreamingTickRecord, Time
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from .api import Api
+
+_MISSING = -(2**63)
+"Stored in place of null values."
+
+_INDEX_ENTRY = struct.Struct("<qqQII")
+"Block index entry: first time, last time, offset, compressed length, record count."
+
+_BLOCK_HEADER = struct.Struct("<BI")
+"Block header: price digits, length of the symbol table."
+
+TICK_COLUMNS = (
+    ("timestamp", "time"),
+    ("symbol", "symbol"),
+    ("level", "int"),
+    ("quoteId", "int"),
+    ("bid", "price"),
+    ("ask", "price"),
+    ("high", "price"),
+    ("low", "price"),
+    ("spreadRaw", "price"),
+    ("spreadTable", "price"),
+    ("bidVolume", "int"),
+    ("askVolume", "int"),
+)
+"Stored columns of `STREAMING_TICK_RECORD`."
+
+CANDLE_COLUMNS = (
+    ("ctm", "time"),
+    ("symbol", "symbol"),
+    ("quoteId", "int"),
+    ("open", "price"),
+    ("high", "price"),
+    ("low", "price"),
+    ("close", "price"),
+    ("vol", "price"),
+)
+"Stored columns of `STREAMING_CANDLE_RECORD`, `ctmString` is not stored."
+
+_KINDS = {
+    "ticks": ("tickPrices", TICK_COLUMNS, StreamingTickRecord),
+    "candles": ("candle", CANDLE_COLUMNS, StreamingCandleRecord),
+}
+
+
+def _encode_block_(
+    records: list[dict], columns: tuple, price_digits: int
+) -> tuple[bytes, Time, Time]:
+    time_field = columns[0][0]
+    records = sorted(records, key=lambda record: record[time_field])
+    scale = 10**price_digits
+    symbols: dict[str, int] = {}
+    parts = []
+    for field, kind in columns:
+        values = [record.get(field) for record in records]
+        if kind == "time":
+            values = [b - a for a, b in zip([0, *values], values)]
+        elif kind == "symbol":
+            values = [symbols.setdefault(value, len(symbols)) for value in values]
+        elif kind == "price":
+            values = [
+                _MISSING if value is None else round(value * scale) for value in values
+            ]
+        else:
+            values = [_MISSING if value is None else int(value) for value in values]
+        parts.append(array("q", values).tobytes())
+    table = json.dumps(list(symbols)).encode()
+    payload = _BLOCK_HEADER.pack(price_digits, len(table)) + table + b"".join(parts)
+    first, last = records[0][time_field], records[-1][time_field]
+    return zlib.compress(payload), first, last
+
+
+def _decode_block_(block: bytes, columns: tuple) -> tuple[list[str], dict[str, array]]:
+    payload = zlib.decompress(block)
+    price_digits, table_length = _BLOCK_HEADER.unpack_from(payload)
+    offset = _BLOCK_HEADER.size
+    symbols = json.loads(payload[offset : offset + table_length])
+    offset += table_length
+    count = (len(payload) - offset) // (8 * len(columns))
+    decoded = {}
+    for field, _ in columns:
+        decoded[field] = array("q", payload[offset : offset + 8 * count])
+        offset += 8 * count
+    decoded["_digits"] = price_digits
+    return symbols, decoded
+
+
+class TickRecorder:
+    """
+    Recorder of streamed ticks and candles into compressed columnar files.
+
+    Attached to an `Api` it receives raw `tickPrices` and `candle` messages and only
+    appends them to an in-memory batch. Full batches are encoded on a background thread:
+    timestamps are delta-encoded, prices are stored as integers scaled by
+    10 to the power of `price_digits`, and every column block is zlib compressed.
+    An index of the time range of each block allows fast replay with `TickReader`.
+
+    Examples:
+        >>> recorder = TickRecorder("recording")
+        >>> async with Api(1000000, "password") as api:
+        >>>     recorder.attach(api)
+        >>>     await api.subscribe_tick_prices(on_tick, "EURUSD")
+        >>>     ...
+        >>> await recorder.close()
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        block_size: int = 8192,
+        price_digits: int = 5,
+    ):
+        """
+        Initialize TickRecorder object
+
+        Args:
+            directory (str | os.PathLike): Directory of the recording.
+            block_size (int, optional): Number of records in one compressed block. Defaults to 8192.
+            price_digits (int, optional): Decimal places of prices kept in the recording. Defaults to 5.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._block_size = block_size
+        self._price_digits = price_digits
+        self._batches: dict[str, list[dict]] = {kind: [] for kind in _KINDS}
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: set[asyncio.Future] = set()
+        self._detach: list[Callable[[], None]] = []
+        self._recorders = {kind: self._recorder_(kind) for kind in _KINDS}
+
+    def attach(self, api: "Api"):
+        """
+        Record streaming messages received by an `Api`.
+
+        Args:
+            api (Api): API connector to record.
+        """
+        for kind, (command, _, _) in _KINDS.items():
+            self._detach.append(api.tap_stream(command, self._recorders[kind]))
+
+    def detach(self):
+        """
+        Stop recording all attached connectors.
+        """
+        for detach in self._detach:
+            detach()
+        self._detach.clear()
+
+    def _recorder_(self, kind: str) -> Callable[[dict], None]:
+        batch_size = self._block_size
+
+        def record(data: dict):
+            batch = self._batches[kind]
+            batch.append(data)
+            if len(batch) >= batch_size:
+                self._flush_(kind)
+
+        return record
+
+    def record_tick(self, tick: dict):
+        """
+        Record a raw `STREAMING_TICK_RECORD`.
+        """
+        self._recorders["ticks"](tick)
+
+    def record_candle(self, candle: dict):
+        """
+        Record a raw `STREAMING_CANDLE_RECORD`.
+        """
+        self._recorders["candles"](candle)
+
+    def _flush_(self, kind: str):
+        batch = self._batches[kind]
+        if not batch:
+            return
+        self._batches[kind] = []
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_block_, kind, batch
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def _write_block_(self, kind: str, records: list[dict]):
+        _, columns, _ = _KINDS[kind]
+        block, first, last = _encode_block_(records, columns, self._price_digits)
+        with (self._directory / f"{kind}.bin").open("ab") as file:
+            offset = file.tell()
+            file.write(block)
+        with (self._directory / f"{kind}.idx").open("ab") as file:
+            file.write(
+                _INDEX_ENTRY.pack(first, last, offset, len(block), len(records))
+            )
+
+    async def flush(self):
+        """
+        Write all buffered records and wait until they are on disk.
+        """
+        for kind in _KINDS:
+            self._flush_(kind)
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def close(self):
+        """
+        Detach, flush and stop the background writer.
+        """
+        self.detach()
+        await self.flush()
+        self._executor.shutdown()
+
+
+class TickReader:
+    """
+    Reader of recordings made by `TickRecorder`.
+
+    Only blocks overlapping the requested time window are decompressed. Records are
+    returned in time order either as record objects or as NumPy columns. `read_arrays`
+    is the high-throughput path, it converts whole columns at millions of records per
+    second. `replay` creates one record object per record, which limits it to a few
+    hundred thousand records per second, use it to feed code expecting streamed records.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        """
+        Initialize TickReader object
+
+        Args:
+            directory (str | os.PathLike): Directory of the recording.
+        """
+        self._directory = Path(directory)
+
+    def _blocks_(self, kind: str, start: Time, end: Time) -> Iterator[bytes]:
+        index_path = self._directory / f"{kind}.idx"
+        if not index_path.exists():
+            return
+        entries = _INDEX_ENTRY.iter_unpack(index_path.read_bytes())
+        with (self._directory / f"{kind}.bin").open("rb") as file:
+            for first, last, offset, length, _ in entries:
+                if last < start or first > end:
+                    continue
+                file.seek(offset)
+                yield file.read(length)
+
+    def _columns_(self, kind: str, start: Time, end: Time):
+        _, columns, _ = _KINDS[kind]
+        for block in self._blocks_(kind, start, end):
+            yield _decode_block_(block, columns)
+
+    def replay(
+        self, start: Time = 0, end: Time = 2**62, kind: str = "ticks"
+    ) -> Iterator[StreamingTickRecord | StreamingCandleRecord]:
+        """
+        Replay recorded records in time order.
+
+        Every record is built as a record object, for bulk reads of long windows use
+        the much faster `read_arrays`.
+
+        Args:
+            start (Time, optional): Start of the window in milliseconds. Defaults to 0.
+            end (Time, optional): End of the window in milliseconds. Defaults to all records.
+            kind (str, optional): "ticks" or "candles". Defaults to "ticks".
+
+        Returns:
+            Iterator[StreamingTickRecord | StreamingCandleRecord]: Records in the window.
+        """
+        _, columns, Type = _KINDS[kind]
+        names = [field for field, _ in columns]
+        members = {
+            field: {member.value: member for member in hint}
+            for field, hint in typing.get_type_hints(Type).items()
+            if isinstance(hint, type) and issubclass(hint, enum.Enum)
+        }
+        new = object.__new__
+
+        def records(symbols: list[str], decoded: dict[str, array]):
+            times = list(itertools.accumulate(decoded[names[0]]))
+            first, last = bisect.bisect_left(times, start), bisect.bisect_right(times, end)
+            divisor = 10 ** decoded["_digits"]
+            values = []
+            for field, column_kind in columns:
+                column = decoded[field][first:last]
+                if column_kind == "time":
+                    column = times[first:last]
+                elif column_kind == "symbol":
+                    column = [symbols[value] for value in column]
+                elif column_kind == "price":
+                    column = [
+                        None if value == _MISSING else value / divisor
+                        for value in column
+                    ]
+                elif field in members:
+                    lookup = members[field]
+                    column = [
+                        None if value == _MISSING else lookup[value] for value in column
+                    ]
+                else:
+                    column = [None if value == _MISSING else value for value in column]
+                values.append(column)
+            for row in zip(*values):
+                state = dict(zip(names, row))
+                if Type is StreamingCandleRecord:
+                    state["ctmString"] = ""
+                state["_other"] = {}
+                record = new(Type)
+                record.__dict__ = state
+                yield record
+
+        blocks = [
+            records(symbols, decoded)
+            for symbols, decoded in self._columns_(kind, start, end)
+        ]
+        if len(blocks) == 1:
+            yield from blocks[0]
+            return
+        yield from heapq.merge(*blocks, key=operator.attrgetter(names[0]))
+
+    def read_arrays(
+        self, start: Time = 0, end: Time = 2**62, kind: str = "ticks"
+    ) -> dict[str, "ndarray"]:
+        """
+        Read recorded records in time order as NumPy columns.
+
+        Prices are float64, null values of integer columns are returned as the int64
+        minimum, symbols as an array of strings.
+
+        Args:
+            start (Time, optional): Start of the window in milliseconds. Defaults to 0.
+            end (Time, optional): End of the window in milliseconds. Defaults to all records.
+            kind (str, optional): "ticks" or "candles". Defaults to "ticks".
+
+        Returns:
+            dict[str, ndarray]: Columns keyed by field name.
+        """
+        if np is None:
+            raise ImportError("numpy is required for array reads, install pyxtb[numpy]")
+        _, columns, _ = _KINDS[kind]
+        parts: dict[str, list] = {field: [] for field, _ in columns}
+        for symbols, decoded in self._columns_(kind, start, end):
+            scale = 10.0 ** -decoded["_digits"]
+            for field, column_kind in columns:
+                column = np.frombuffer(decoded[field], dtype=np.int64)
+                if column_kind == "time":
+                    column = np.cumsum(column)
+                elif column_kind == "symbol":
+                    column = np.asarray(symbols, dtype=object)[column]
+                elif column_kind == "price":
+                    column = np.where(column == _MISSING, np.nan, column * scale)
+                parts[field].append(column)
+
+        time_field = columns[0][0]
+        if not parts[time_field]:
+            return {field: np.array([]) for field in parts}
+        result = {field: np.concatenate(values) for field, values in parts.items()}
+        order = np.argsort(result[time_field], kind="stable")
+        times = result[time_field][order]
+        window = slice(
+            np.searchsorted(times, start, "left"), np.searchsorted(times, end, "right")
+        )
+        return {field: values[order][window] for field, values in result.items()}
@@ -0,0 +1,352 @@
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from .api import Api
+
+_MAGIC = b"PYXTBSHM"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")
+"Magic, version, record size and capacity at the start of the buffer."
+_HEAD = struct.Struct("<Q")
+_HEAD_OFFSET = 32
+"Offset of the sequence number of the latest published record."
+_HEADER_SIZE = 64
+_RECORD = struct.Struct("<QBb6x16sq6d")
+"Sequence number, kind, depth level, symbol, time and six values of a record."
+
+TICK = 0
+"Record kind of `tickPrices` messages."
+CANDLE = 1
+"Record kind of `candle` messages."
+
+DEFAULT_CAPACITY = 65536
+"Default number of records kept in the ring buffer."
+
+
+class ShmTick(NamedTuple):
+    """
+    Tick read from a shared-memory ring buffer
+    """
+
+    seq: int
+    symbol: str
+    level: int
+    timestamp: int
+    bid: float
+    ask: float
+    high: float
+    low: float
+    bidVolume: float
+    askVolume: float
+
+
+class ShmCandle(NamedTuple):
+    """
+    M1 candle read from a shared-memory ring buffer
+    """
+
+    seq: int
+    symbol: str
+    ctm: int
+    open: float
+    high: float
+    low: float
+    close: float
+    vol: float
+
+
+def _attach_(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without registering it with the resource tracker,
+    which would remove the block when the reading process exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class ShmTickPublisher:
+    """
+    Publisher of streamed ticks and candles into a shared-memory ring buffer.
+
+    Records are fixed-size binary structs, so readers in other processes access them
+    in place without pickling. Each record carries a sequence number. The buffer keeps
+    the latest `capacity` records, a reader falling further behind loses the oldest
+    ones. There is a single writer, readers never block it.
+
+    Examples:
+        >>> publisher = ShmTickPublisher("xtb-ticks")
+        >>> async with Api(1000000, "password") as api:
+        >>>     publisher.attach(api)
+        >>>     await api.subscribe_tick_prices(lambda tick: None, "EURUSD")
+        >>>     ...
+        >>> publisher.close()
+    """
+
+    def __init__(self, name: str | None = None, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize ShmTickPublisher object
+
+        Args:
+            name (str | None, optional): Name of the shared memory block readers attach to. Defaults to a generated name.
+            capacity (int, optional): Number of records kept. Defaults to 65536.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._shm = shared_memory.SharedMemory(
+            name, create=True, size=_HEADER_SIZE + capacity * _RECORD.size
+        )
+        self.capacity = capacity
+        self._buf = self._shm.buf
+        _HEADER.pack_into(self._buf, 0, _MAGIC, _VERSION, _RECORD.size, capacity)
+        _HEAD.pack_into(self._buf, _HEAD_OFFSET, 0)
+        self.sequence = 0
+        "Sequence number of the latest published record."
+        self._detach: list[Callable[[], None]] = []
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block.
+        """
+        return self._shm.name
+
+    def _publish_(self, kind: int, symbol: str, level: int, timestamp: int, *values):
+        seq = self.sequence + 1
+        offset = _HEADER_SIZE + (seq % self.capacity) * _RECORD.size
+        buf = self._buf
+        _HEAD.pack_into(buf, offset, 0)
+        _RECORD.pack_into(
+            buf, offset, seq, kind, level, symbol.encode()[:16], timestamp, *values
+        )
+        _HEAD.pack_into(buf, _HEAD_OFFSET, seq)
+        self.sequence = seq
+
+    def publish_tick(self, tick: dict):
+        """
+        Publish a raw `STREAMING_TICK_RECORD`.
+        """
+        self._publish_(
+            TICK,
+            tick["symbol"],
+            tick.get("level") or 0,
+            tick["timestamp"],
+            tick["bid"],
+            tick["ask"],
+            tick.get("high") or 0.0,
+            tick.get("low") or 0.0,
+            tick.get("bidVolume") or 0.0,
+            tick.get("askVolume") or 0.0,
+        )
+
+    def publish_candle(self, candle: dict):
+        """
+        Publish a raw `STREAMING_CANDLE_RECORD`.
+        """
+        self._publish_(
+            CANDLE,
+            candle["symbol"],
+            0,
+            candle["ctm"],
+            candle["open"],
+            candle["high"],
+            candle["low"],
+            candle["close"],
+            candle.get("vol") or 0.0,
+            0.0,
+        )
+
+    def attach(self, api: "Api"):
+        """
+        Publish `tickPrices` and `candle` messages received by an `Api`.
+
+        The publisher only observes messages, symbols have to be subscribed.
+
+        Args:
+            api (Api): API connector to publish.
+        """
+        self._detach.append(api.tap_stream("tickPrices", self.publish_tick))
+        self._detach.append(api.tap_stream("candle", self.publish_candle))
+
+    def detach(self):
+        """
+        Stop publishing all attached connectors.
+        """
+        for detach in self._detach:
+            detach()
+        self._detach.clear()
+
+    def close(self, unlink: bool = True):
+        """
+        Detach and release the shared memory block.
+
+        Args:
+            unlink (bool, optional): Remove the block, readers still attached keep their mapping. Defaults to True.
+        """
+        self.detach()
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+class ShmTickReader:
+    """
+    Reader of a ring buffer written by `ShmTickPublisher` in another process.
+
+    Records are unpacked straight from the shared mapping. A record which was
+    overwritten while being read is detected by its sequence number and counted in
+    `lost` like records the reader fell too far behind to read.
+
+    Examples:
+        >>> reader = ShmTickReader("xtb-ticks")
+        >>> while True:
+        >>>     for record in reader.wait():
+        >>>         if isinstance(record, ShmTick):
+        >>>             strategy.on_tick(record)
+    """
+
+    def __init__(self, name: str, start: str = "latest"):
+        """
+        Initialize ShmTickReader object
+
+        Args:
+            name (str): Name of the shared memory block.
+            start (str, optional): "latest" to read only records published from now on, "oldest" to read all kept records first. Defaults to "latest".
+        """
+        self._shm = _attach_(name)
+        self._buf = self._shm.buf
+        magic, version, record_size, capacity = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            self._shm.close()
+            raise ValueError(f"{name} is not a pyxtb tick ring buffer")
+        self.capacity = capacity
+        head = self.head
+        self._next = head + 1 if start == "latest" else max(head - capacity + 1, 1)
+        self.lost = 0
+        "Records overwritten before they were read."
+
+    @property
+    def head(self) -> int:
+        """
+        Sequence number of the latest published record.
+        """
+        return _HEAD.unpack_from(self._buf, _HEAD_OFFSET)[0]
+
+    def poll(self, limit: int | None = None) -> list[ShmTick | ShmCandle]:
+        """
+        Read records published since the previous call, without waiting.
+
+        Args:
+            limit (int | None, optional): Maximal number of records returned. Defaults to all available.
+
+        Returns:
+            list[ShmTick | ShmCandle]: Records in publishing order.
+        """
+        buf = self._buf
+        capacity = self.capacity
+        head = self.head
+        seq = self._next
+        if head - seq + 1 > capacity:
+            self.lost += head - capacity + 1 - seq
+            seq = head - capacity + 1
+        if limit is not None:
+            head = min(head, seq + limit - 1)
+        records = []
+        while seq <= head:
+            offset = _HEADER_SIZE + (seq % capacity) * _RECORD.size
+            written, kind, level, symbol, timestamp, *values = _RECORD.unpack_from(
+                buf, offset
+            )
+            if written != seq or _HEAD.unpack_from(buf, offset)[0] != seq:
+                self.lost += 1
+            elif kind == TICK:
+                records.append(
+                    ShmTick(
+                        seq, symbol.rstrip(b"\0").decode(), level, timestamp, *values
+                    )
+                )
+            else:
+                records.append(
+                    ShmCandle(
+                        seq, symbol.rstrip(b"\0").decode(), timestamp, *values[:5]
+                    )
+                )
+            seq += 1
+        self._next = seq
+        return records
+
+    def wait(
+        self, timeout: float | None = None, interval: float = 0.0005
+    ) -> list[ShmTick | ShmCandle]:
+        """
+        Read new records, polling until at least one is published.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait, None waits forever. Defaults to None.
+            interval (float, optional): Seconds between polls. Defaults to 0.0005.
+
+        Returns:
+            list[ShmTick | ShmCandle]: Records in publishing order, empty on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            records = self.poll()
+            if records or (deadline is not None and time.monotonic() >= deadline):
+                return records
+            time.sleep(interval)
+
+    def array(self) -> "ndarray":
+        """
+        Zero-copy NumPy view of all record slots of the ring buffer.
+
+        Slots are ordered by position, not by sequence number, and are overwritten
+        while being viewed, use the `seq` field to select and validate records. Views
+        have to be released before `close`.
+
+        Returns:
+            ndarray: Structured array with fields seq, kind, level, symbol, time and values.
+        """
+        if np is None:
+            raise ImportError("numpy is required for array views, install pyxtb[numpy]")
+        dtype = np.dtype(
+            {
+                "names": ["seq", "kind", "level", "symbol", "time", "values"],
+                "formats": ["<u8", "u1", "i1", "S16", "<i8", ("<f8", 6)],
+                "offsets": [0, 8, 9, 16, 32, 40],
+                "itemsize": _RECORD.size,
+            }
+        )
+        return np.ndarray(
+            (self.capacity,), dtype=dtype, buffer=self._buf, offset=_HEADER_SIZE
+        )
+
+    def close(self):
+        """
+        Release the mapping of the shared memory block.
+        """
+        self._buf = None
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
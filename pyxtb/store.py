@@ -0,0 +1,320 @@
+import asyncio
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ._codec import decode
+from ._types import ChartRangeInfoRecord, ChartResponseRecord, Period, Time
+from .bars import bar_start
+from .chart import RATE_INFO_FIELDS, ChartFrame
+from .history import MAX_CANDLES
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from .api import Api
+
+_RECORD = struct.Struct("<6d")
+"Bar record: ctm, open, high, low, close, vol in the encoding sent by the server."
+
+
+class _Series:
+    """
+    Fixed-width bar file of one (symbol, period) with its coverage metadata.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta_path = path.with_suffix(".json")
+        self.lock = asyncio.Lock()
+        self.meta = (
+            json.loads(self.meta_path.read_text()) if self.meta_path.exists() else None
+        )
+        self._map: mmap.mmap | None = None
+        self._map_size = 0
+
+    def __len__(self) -> int:
+        return self.path.stat().st_size // _RECORD.size if self.path.exists() else 0
+
+    def buffer(self) -> memoryview:
+        """
+        Memory-mapped contents of the bar file, remapped when the file has grown.
+        """
+        size = len(self) * _RECORD.size
+        if not size:
+            return memoryview(b"")
+        if self._map is None or self._map_size != size:
+            with self.path.open("rb") as file:
+                self._map = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+            self._map_size = size
+        return memoryview(self._map)
+
+    def ctm(self, index: int) -> Time:
+        return int(_RECORD.unpack_from(self.buffer(), index * _RECORD.size)[0])
+
+    def bisect(self, ctm: Time) -> int:
+        """
+        Index of the first bar starting at or after `ctm`.
+        """
+        return bisect.bisect_left(range(len(self)), ctm, key=self.ctm)
+
+    def save_meta(self, digits: int, start: Time, end: Time):
+        self.meta = {"digits": digits, "start": start, "end": end}
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.meta))
+        os.replace(tmp_path, self.meta_path)
+
+    def append(self, rates: list[dict]):
+        """
+        Append bars newer than the stored ones.
+
+        A bar starting at the same time as the last stored bar replaces it, as the
+        last bar of a range may still have been forming when it was stored.
+        """
+        count = len(self)
+        last = self.ctm(count - 1) if count else None
+        with self.path.open("r+b" if count else "wb") as file:
+            file.seek(0, os.SEEK_END)
+            for rate in rates:
+                if last is not None and rate["ctm"] < last:
+                    continue
+                if rate["ctm"] == last:
+                    file.seek(-_RECORD.size, os.SEEK_END)
+                file.write(_RECORD.pack(*(rate[field] for field in RATE_INFO_FIELDS)))
+                last = rate["ctm"]
+
+    def prepend(self, rates: list[dict]):
+        """
+        Insert bars older than the stored ones by rewriting the file.
+        """
+        first = self.ctm(0) if len(self) else None
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("wb") as file:
+            for rate in rates:
+                if first is None or rate["ctm"] < first:
+                    file.write(
+                        _RECORD.pack(*(rate[field] for field in RATE_INFO_FIELDS))
+                    )
+            file.write(self.buffer())
+        self._map = None
+        os.replace(tmp_path, self.path)
+
+
+class BarStore:
+    """
+    Persistent on-disk store of chart bars.
+
+    Every (symbol, period) series is an append-only file of fixed-width binary records
+    read through a memory map. The covered time range of each series is kept next to it,
+    so a chart request only fetches the parts of the range not stored yet. Extending a
+    series back in time rewrites its file.
+
+    Examples:
+        >>> store = BarStore("bars")
+        >>> async with Api(1000000, "password", bar_store=store) as api:
+        >>>     chart = await api.get_chart_range_request(info, as_arrays=True)
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        """
+        Initialize BarStore object
+
+        Args:
+            directory (str | os.PathLike): Directory holding the bar files.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._series: dict[tuple[str, Period], _Series] = {}
+
+    def _get_series_(self, symbol: str, period: Period) -> _Series:
+        key = (symbol, Period(period))
+        if key not in self._series:
+            name = symbol.replace(os.sep, "_")
+            self._series[key] = _Series(self._directory / f"{name}_{int(period)}.bars")
+        return self._series[key]
+
+    def coverage(self, symbol: str, period: Period) -> tuple[Time, Time] | None:
+        """
+        Time range stored for a series.
+
+        Args:
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+
+        Returns:
+            tuple[Time, Time] | None: Covered (start, end) or None if nothing is stored.
+        """
+        meta = self._get_series_(symbol, period).meta
+        return (meta["start"], meta["end"]) if meta else None
+
+    def read_array(
+        self, symbol: str, period: Period, start: Time, end: Time
+    ) -> "ndarray":
+        """
+        Zero-copy view of stored bars in the given range.
+
+        Args:
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+            start (Time): Start of the range.
+            end (Time): End of the range, exclusive like in `getChartRangeRequest`.
+
+        Returns:
+            ndarray: Read-only float64 array of shape (n, 6) with columns ctm, open, high,
+                low, close, vol in the encoding sent by the server.
+        """
+        if np is None:
+            raise ImportError("numpy is required for array reads, install pyxtb[numpy]")
+        series = self._get_series_(symbol, period)
+        rates = np.frombuffer(series.buffer(), dtype="<f8").reshape(
+            -1, len(RATE_INFO_FIELDS)
+        )
+        ctm = rates[:, 0]
+        return rates[
+            np.searchsorted(ctm, start, "left") : np.searchsorted(ctm, end, "left")
+        ]
+
+    def read(self, symbol: str, period: Period, start: Time, end: Time) -> dict:
+        """
+        Stored bars in the given range in the format of a chart response.
+
+        Args:
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+            start (Time): Start of the range.
+            end (Time): End of the range, exclusive like in `getChartRangeRequest`.
+
+        Returns:
+            dict: Raw chart response with `digits` and `rateInfos`. `ctmString` is not
+                stored and is returned empty.
+        """
+        series = self._get_series_(symbol, period)
+        begin, stop = series.bisect(start), series.bisect(end)
+        buffer = series.buffer()[begin * _RECORD.size : stop * _RECORD.size]
+        rate_infos = []
+        for ctm, *values in _RECORD.iter_unpack(buffer):
+            rate = dict(zip(RATE_INFO_FIELDS, (int(ctm), *values)))
+            rate["ctmString"] = ""
+            rate_infos.append(rate)
+        return {
+            "digits": series.meta["digits"] if series.meta else 0,
+            "rateInfos": rate_infos,
+        }
+
+    async def _fetch_(
+        self, api: "Api", symbol: str, period: Period, start: Time, end: Time
+    ) -> tuple[int, list[dict]]:
+        span = MAX_CANDLES * int(period) * 60_000
+        digits, rates = 0, []
+        while start < end:
+            info = ChartRangeInfoRecord(
+                period=Period(period),
+                start=start,
+                symbol=symbol,
+                end=min(start + span, end),
+                ticks=0,
+                _other={},
+            )
+            data = await api._send_and_read_command_(
+                "getChartRangeRequest",
+                None,
+                as_json=True,
+                arguments=dict(info=info.to_dict()),
+            )
+            digits = data["digits"]
+            rates += data["rateInfos"]
+            start = info.end
+        return digits, rates
+
+    async def fill(
+        self, api: "Api", symbol: str, period: Period, start: Time, end: Time
+    ):
+        """
+        Fetch the parts of the range which are not stored yet.
+
+        The end of the range is clamped to the current time. Coverage is stored only up
+        to the start of the bar still forming, so that bar is fetched again by later
+        requests. A range which is covered already returns without fetching or writing
+        anything.
+
+        Args:
+            api (Api): Logged in API connector used for missing ranges.
+            symbol (str): Symbol name.
+            period (Period): Chart period.
+            start (Time): Start of the range.
+            end (Time): End of the range.
+        """
+        series = self._get_series_(symbol, period)
+        now = int(time.time() * 1000)
+        end = min(end, now)
+        if start >= end:
+            return
+        closed_end = max(start, min(end, bar_start(period, now)))
+        async with series.lock:
+            if not series.meta:
+                digits, rates = await self._fetch_(api, symbol, period, start, end)
+                series.append(rates)
+                series.save_meta(digits, start, closed_end)
+                return
+
+            covered_start, covered_end = series.meta["start"], series.meta["end"]
+            digits = series.meta["digits"]
+            if start >= covered_start and end <= covered_end:
+                return
+            if start < covered_start:
+                digits, rates = await self._fetch_(
+                    api, symbol, period, start, covered_start
+                )
+                series.prepend(rates)
+                covered_start = start
+            if end > covered_end:
+                count = len(series)
+                fetch_start = (
+                    min(series.ctm(count - 1), covered_end) if count else covered_end
+                )
+                digits, rates = await self._fetch_(
+                    api, symbol, period, fetch_start, end
+                )
+                series.append(rates)
+                covered_end = max(covered_end, closed_end)
+            if (covered_start, covered_end) != (
+                series.meta["start"],
+                series.meta["end"],
+            ):
+                series.save_meta(digits, covered_start, covered_end)
+
+    async def get_chart_range(
+        self, api: "Api", info: ChartRangeInfoRecord, as_arrays: bool = False
+    ) -> ChartResponseRecord | ChartFrame:
+        """
+        Answer a chart range request from the store, fetching only missing ranges.
+
+        Args:
+            api (Api): Logged in API connector used for missing ranges.
+            info (ChartRangeInfoRecord): Chart range request.
+            as_arrays (bool, optional): If True, returns `ChartFrame`. Defaults to False.
+
+        Returns:
+            ChartResponseRecord | ChartFrame: Stored bars in the requested range.
+        """
+        await self.fill(api, info.symbol, info.period, info.start, info.end)
+        if as_arrays:
+            series = self._get_series_(info.symbol, info.period)
+            return ChartFrame.from_raw(
+                series.meta["digits"] if series.meta else 0,
+                self.read_array(info.symbol, info.period, info.start, info.end),
+            )
+        return decode(
+            ChartResponseRecord,
+            self.read(info.symbol, info.period, info.start, info.end),
+        )
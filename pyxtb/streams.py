@@ -0,0 +1,265 @@
+import asyncio
+import enum
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from ._codec import decoder
+
+T = TypeVar("T")
+
+DEFAULT_STREAM_SIZE = 1000
+"Default capacity of a stream queue in messages."
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    What a stream does with a message arriving when its queue is full
+    """
+
+    BLOCK = "block"
+    "Stop reading the streaming connection until the consumer catches up"
+    DROP_OLDEST = "drop_oldest"
+    "Discard the oldest queued message"
+    DROP_NEWEST = "drop_newest"
+    "Discard the arriving message"
+    ERROR = "error"
+    "Fail the stream, the consumer receives `StreamOverflowError`"
+
+
+class StreamOverflowError(Exception):
+    """
+    Raised to the consumer of a stream with `OverflowPolicy.ERROR` which fell behind.
+    """
+
+
+@dataclass
+class StreamStats:
+    """
+    Snapshot of stream queue counters
+    """
+
+    depth: int
+    "Messages currently queued"
+    maxsize: int
+    "Queue capacity, 0 for conflated streams holding one message per key"
+    received: int
+    "Messages received since the stream started"
+    dropped: int
+    "Messages discarded by the overflow policy"
+    blocked: int
+    "Times the streaming connection waited for this consumer"
+
+
+class Stream(Generic[T]):
+    """
+    Bounded asynchronous iterator over streaming messages of one subscription.
+
+    Raw messages are queued by the streaming reader and decoded only when the consumer
+    pulls them, so dropped messages are never decoded. The server subscription starts
+    with the first pull or when entering the context and stops on `aclose`.
+
+    Examples:
+        >>> async with api.stream_tick_prices("EURUSD", maxsize=100) as ticks:
+        >>>     async for tick in ticks:
+        >>>         print(tick.bid)
+    """
+
+    def __init__(
+        self,
+        subscribe: Callable[[Callable[[dict], None]], Awaitable[Callable]],
+        Type: type[T] | None,
+        maxsize: int = DEFAULT_STREAM_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        blocked: set["Stream"] | None = None,
+    ):
+        """
+        Initialize Stream object
+
+        Args:
+            subscribe (Callable): Coroutine function registering a raw listener and returning its unsubscribe function.
+            Type (type[T] | None): Record type messages are decoded to, None for raw data.
+            maxsize (int, optional): Queue capacity. Defaults to 1000.
+            policy (OverflowPolicy, optional): Overflow policy. Defaults to `OverflowPolicy.BLOCK`.
+            blocked (set[Stream] | None, optional): Streams the streaming reader waits for, shared with `Api`. Defaults to None.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._subscribe = subscribe
+        self._decode = decoder(Type) if Type else None
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self._blocked = blocked if blocked is not None else set()
+        self._queue: deque[dict] = deque()
+        self._waiting: deque[dict] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._unsubscribe: Callable | None = None
+        self._started = False
+        self._closed = False
+        self._error: Exception | None = None
+        self._received = 0
+        self._dropped = 0
+        self._blocked_count = 0
+
+    def _put_(self, data: dict):
+        if self._error or self._closed:
+            return
+        self._received += 1
+        queue = self._queue
+        if len(queue) >= self.maxsize:
+            policy = self.policy
+            if policy is OverflowPolicy.DROP_NEWEST:
+                self._dropped += 1
+                return
+            if policy is OverflowPolicy.DROP_OLDEST:
+                queue.popleft()
+                self._dropped += 1
+            elif policy is OverflowPolicy.ERROR:
+                self._dropped += 1 + len(queue)
+                queue.clear()
+                self._error = StreamOverflowError(
+                    f"Stream queue of {self.maxsize} messages overflowed"
+                )
+                self._readable.set()
+                return
+            else:
+                self._waiting.append(data)
+                self._writable.clear()
+                self._blocked.add(self)
+                self._blocked_count += 1
+                return
+        queue.append(data)
+        self._readable.set()
+
+    async def wait_writable(self):
+        """
+        Wait until blocked messages entered the queue or the stream is closed.
+        """
+        while self._waiting and not self._closed:
+            await self._writable.wait()
+
+    async def start(self):
+        """
+        Start the server subscription, called by the first pull if not called before.
+        """
+        if self._started:
+            return
+        self._started = True
+        self._unsubscribe = await self._subscribe(self._put_)
+
+    async def aclose(self):
+        """
+        Stop the subscription and release a streaming reader waiting for this stream.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._blocked.discard(self)
+        self._writable.set()
+        self._readable.set()
+        if self._unsubscribe:
+            unsubscribe, self._unsubscribe = self._unsubscribe, None
+            await unsubscribe()
+
+    def _pop_(self) -> dict:
+        return self._queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> T:
+        if not self._started:
+            await self.start()
+        while not self._queue:
+            if self._error:
+                await self.aclose()
+                raise self._error
+            if self._closed:
+                raise StopAsyncIteration
+            self._readable.clear()
+            await self._readable.wait()
+        data = self._pop_()
+        waiting = self._waiting
+        while waiting and len(self._queue) < self.maxsize:
+            self._queue.append(waiting.popleft())
+        if not waiting:
+            self._writable.set()
+        return self._decode(data) if self._decode else data
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        return False
+
+    @property
+    def depth(self) -> int:
+        """
+        Messages currently queued.
+        """
+        return len(self._queue)
+
+    @property
+    def stats(self) -> StreamStats:
+        """
+        Counters of this stream.
+        """
+        return StreamStats(
+            depth=len(self._queue),
+            maxsize=self.maxsize,
+            received=self._received,
+            dropped=self._dropped,
+            blocked=self._blocked_count,
+        )
+
+
+class ConflatedStream(Stream[T]):
+    """
+    Stream keeping only the latest undelivered message of every key.
+
+    A message replaces the queued message with the same key in place, so keys are
+    delivered in the order they first changed since the last pull and a slow consumer
+    always receives the latest value. Replaced messages are counted as dropped and are
+    never decoded. The queue holds at most one message per key, so it needs no
+    overflow policy.
+
+    Examples:
+        >>> async with api.stream_tick_prices("EURUSD", conflate=True) as ticks:
+        >>>     async for tick in ticks:
+        >>>         await redraw(tick)
+    """
+
+    def __init__(
+        self,
+        subscribe: Callable[[Callable[[dict], None]], Awaitable[Callable]],
+        Type: type[T] | None,
+        key: tuple[str, ...],
+    ):
+        """
+        Initialize ConflatedStream object
+
+        Args:
+            subscribe (Callable): Coroutine function registering a raw listener and returning its unsubscribe function.
+            Type (type[T] | None): Record type messages are decoded to, None for raw data.
+            key (tuple[str, ...]): Message fields identifying the conflated value.
+        """
+        super().__init__(subscribe, Type, maxsize=1, policy=OverflowPolicy.DROP_OLDEST)
+        self.maxsize = 0
+        self._key = key
+        self._queue: dict = {}
+
+    def _put_(self, data: dict):
+        if self._closed:
+            return
+        self._received += 1
+        key = tuple(data.get(field) for field in self._key)
+        if key in self._queue:
+            self._dropped += 1
+        self._queue[key] = data
+        self._readable.set()
+
+    def _pop_(self) -> dict:
+        return self._queue.pop(next(iter(self._queue)))
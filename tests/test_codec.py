@@ -0,0 +1,85 @@
+import enum
+import typing
+from dataclasses import fields, is_dataclass
+
+import pytest
+from dataclasses_json import CatchAll
+
+from pyxtb import _types
+from pyxtb._codec import _unwrap_optional_, decode
+
+RECORDS = [
+    Type
+    for Type in vars(_types).values()
+    if isinstance(Type, type) and is_dataclass(Type) and hasattr(Type, "from_dict")
+]
+
+
+def _sample_(hint, variant: str):
+    """
+    Raw value of a field, "full" fills optional fields, "empty" leaves them None and
+    "coerced" gives numbers of the other numeric type.
+    """
+    if hint is not _unwrap_optional_(hint):
+        return None if variant == "empty" else _sample_(_unwrap_optional_(hint), variant)
+    origin = typing.get_origin(hint)
+    if origin is typing.Literal:
+        return typing.get_args(hint)[0]
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        return [_sample_(item, variant), _sample_(item, variant)]
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        return list(hint)[-1].value
+    if is_dataclass(hint):
+        return _record_(hint, variant)
+    if hint is bool:
+        return True
+    if hint is int:
+        return 7.0 if variant == "coerced" else 7
+    if hint is float:
+        return 2 if variant == "coerced" else 2.5
+    if hint is str:
+        return "EURUSD"
+    raise TypeError(f"No sample for {hint!r}")
+
+
+def _record_(Type, variant: str) -> dict:
+    hints = typing.get_type_hints(Type)
+    return {
+        field.name: _sample_(hints[field.name], variant)
+        for field in fields(Type)
+        if hints[field.name] != CatchAll
+    }
+
+
+@pytest.mark.parametrize("variant", ["full", "empty", "coerced"])
+@pytest.mark.parametrize("Type", RECORDS, ids=lambda Type: Type.__name__)
+def test_decode_matches_from_dict(Type, variant):
+    data = _record_(Type, variant)
+    assert decode(Type, data) == Type.from_dict(data)
+
+
+@pytest.mark.parametrize("Type", RECORDS, ids=lambda Type: Type.__name__)
+def test_decode_collects_unknown_fields(Type):
+    data = {**_record_(Type, "full"), "unknownField": 1, "anotherField": [1, 2]}
+    decoded = decode(Type, data)
+    assert decoded == Type.from_dict(data)
+    assert decoded._other == {"unknownField": 1, "anotherField": [1, 2]}
+
+
+def test_decode_enums_and_nested_lists():
+    data = _record_(_types.ChartResponseRecord, "full")
+    decoded = decode(_types.ChartResponseRecord, data)
+    assert decoded == _types.ChartResponseRecord.from_dict(data)
+    assert all(isinstance(info, _types.RateInfoRecord) for info in decoded.rateInfos)
+
+    trade = decode(_types.TradeRecord, _record_(_types.TradeRecord, "empty"))
+    assert isinstance(trade.cmd, _types.Command)
+    assert trade.close_time is None
+
+
+def test_decode_list_of_records():
+    data = [_record_(_types.TickRecord, "full"), _record_(_types.TickRecord, "empty")]
+    assert decode(_types.TickRecord, data) == [
+        _types.TickRecord.from_dict(record) for record in data
+    ]